@@ -0,0 +1,70 @@
+"""create archive tables
+
+Revision ID: a9d3e6f1c5b4
+Revises: f7c4b8e1a2d6
+Create Date: 2026-10-18 18:02:31.740256
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e6f1c5b4'
+down_revision: Union[str, Sequence[str], None] = 'f7c4b8e1a2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The enum types already exist (created with orders, order_items and payments)
+    op.create_table('orders_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'PREPARING', 'AWAITING_CONFIRMATION', 'CANCELED', 'COMPLETED', name='orderstatus', create_type=False), nullable=False),
+    sa.Column('user', sa.Integer(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('confirmed_on', sa.DateTime(), nullable=True),
+    sa.Column('estimated_time', sa.DateTime(), nullable=True),
+    sa.Column('order_ready_in', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orders_archive_user'), 'orders_archive', ['user'], unique=False)
+    op.create_index(op.f('ix_orders_archive_created_at'), 'orders_archive', ['created_at'], unique=False)
+    op.create_table('order_item_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('flavor', sa.String(length=200), nullable=False),
+    sa.Column('size', postgresql.ENUM('SMALL', 'AVERAGE', 'BIG', name='itemsize', create_type=False), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['order'], ['orders_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_item_archive_order'), 'order_item_archive', ['order'], unique=False)
+    op.create_table('payments_archive',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'PAID', 'CANCELED', name='paymentstatus', create_type=False), nullable=False),
+    sa.Column('related_order', sa.Integer(), nullable=False),
+    sa.Column('amount_paid', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['related_order'], ['orders_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_archive_related_order'), 'payments_archive', ['related_order'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payments_archive_related_order'), table_name='payments_archive')
+    op.drop_table('payments_archive')
+    op.drop_index(op.f('ix_order_item_archive_order'), table_name='order_item_archive')
+    op.drop_table('order_item_archive')
+    op.drop_index(op.f('ix_orders_archive_created_at'), table_name='orders_archive')
+    op.drop_index(op.f('ix_orders_archive_user'), table_name='orders_archive')
+    op.drop_table('orders_archive')
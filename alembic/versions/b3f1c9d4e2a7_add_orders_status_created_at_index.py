@@ -0,0 +1,35 @@
+"""add orders status created_at index
+
+Revision ID: b3f1c9d4e2a7
+Revises: 7a8dacb62089
+Create Date: 2026-10-18 10:12:40.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c9d4e2a7'
+down_revision: Union[str, Sequence[str], None] = '7a8dacb62089'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Listing by status for one day: equality on status, then a range on created_at.
+    # On PostgreSQL the remaining listed columns are carried in the index (index-only scan).
+    op.create_index(
+        'ix_orders_status_created_at',
+        'orders',
+        ['status', 'created_at'],
+        unique=False,
+        postgresql_include=['id', 'user', 'price', 'confirmed_on', 'order_ready_in'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
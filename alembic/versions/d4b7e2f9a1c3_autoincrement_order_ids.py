@@ -0,0 +1,37 @@
+"""autoincrement order ids
+
+Revision ID: d4b7e2f9a1c3
+Revises: c8e1f4a7b2d9
+Create Date: 2026-10-18 21:12:47.603418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e2f9a1c3'
+down_revision: Union[str, Sequence[str], None] = 'c8e1f4a7b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate(table_name: str, autoincrement: bool) -> None:
+    # Only SQLite reuses the highest deleted rowid; PostgreSQL sequences never go back
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table(table_name, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate('orders', True)
+    _recreate('order_item', True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate('order_item', False)
+    _recreate('orders', False)
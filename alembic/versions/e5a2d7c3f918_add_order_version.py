@@ -0,0 +1,29 @@
+"""add order version
+
+Revision ID: e5a2d7c3f918
+Revises: b3f1c9d4e2a7
+Create Date: 2026-10-18 16:40:12.532907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2d7c3f918'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c9d4e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bumped by every status transition; existing rows start at 1
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('orders', 'version')
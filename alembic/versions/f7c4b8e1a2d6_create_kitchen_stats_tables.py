@@ -0,0 +1,52 @@
+"""create kitchen stats tables
+
+Revision ID: f7c4b8e1a2d6
+Revises: e5a2d7c3f918
+Create Date: 2026-10-18 17:25:48.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c4b8e1a2d6'
+down_revision: Union[str, Sequence[str], None] = 'e5a2d7c3f918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BUCKETS = ('le_5', 'le_10', 'le_15', 'le_20', 'le_25', 'le_30', 'le_40', 'le_50', 'le_60', 'le_90', 'le_120', 'gt_120')
+
+
+def _preparation_stats_columns():
+    return [
+        sa.Column('orders_count', sa.Integer(), nullable=False),
+        sa.Column('total_minutes', sa.Float(), nullable=False),
+        sa.Column('total_minutes_squared', sa.Float(), nullable=False),
+        sa.Column('min_minutes', sa.Float(), nullable=True),
+        sa.Column('max_minutes', sa.Float(), nullable=True),
+        *[sa.Column(bucket, sa.Integer(), nullable=False) for bucket in BUCKETS],
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('kitchen_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    *_preparation_stats_columns(),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('kitchen_hourly_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('hour', sa.SmallInteger(), nullable=False),
+    *_preparation_stats_columns(),
+    sa.PrimaryKeyConstraint('day', 'hour')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('kitchen_hourly_stats')
+    op.drop_table('kitchen_daily_stats')
@@ -1,11 +1,11 @@
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
 
 from app.ai.client import AIClient
-from app.services.orders.order import OrderService
-from app.db.models.schemas import OrderStatus, Order
+from app.db.models.schemas import KitchenDailyStats
 from app.repository.order_repository import OrderRepository
+from app.repository.kitchen_stats_repository import KitchenStatsRepository
 
 
 class ReadyTimeEstimationService:
@@ -24,19 +24,23 @@ class ReadyTimeEstimationService:
         - Do not wrap the JSON in ```json
     """
 
-    def __init__(self, order_repository: OrderRepository, order_service: OrderService):
+    def __init__(self, order_repository: OrderRepository, kitchen_stats_repository: KitchenStatsRepository):
 
         self.client = AIClient()
         self.order_repository = order_repository
-        self.order_service = order_service
+        self.kitchen_stats_repository = kitchen_stats_repository
 
     async def estimate(self, target_order: Dict[str, Any]) -> datetime:
 
-        orders = await self.order_service.list_orders(order_status=OrderStatus.COMPLETED)
-        average_minutes = self._calculate_average_preparation_time(orders=orders)
+        # Precomputed aggregates of today's completed orders instead of the orders themselves
+        now = datetime.now(tz=timezone.utc)
+        daily_stats = await self.kitchen_stats_repository.get_daily_stats(now.date())
+        hourly_stats = await self.kitchen_stats_repository.get_hourly_stats(now.date(), now.hour)
+        average_minutes = self._calculate_average_preparation_time(daily_stats)
 
         payload = {
-            "orders_in_preparation": [order.to_dict for order in orders],
+            "completed_orders_today": daily_stats.to_dict if daily_stats else None,
+            "completed_orders_this_hour": hourly_stats.to_dict if hourly_stats else None,
             "average_preparation_minutes": average_minutes,
             "target_order": target_order
         }
@@ -61,20 +65,13 @@ class ReadyTimeEstimationService:
 
     def _calculate_average_preparation_time(
         self,
-        orders: List[Order]
+        daily_stats: Optional[KitchenDailyStats]
     ) -> int:
 
-        durations = []
-
-        for order in orders:
-            if order.confirmed_on and order.order_ready_in:
-                delta = order.order_ready_in - order.confirmed_on
-                durations.append(delta.total_seconds() / 60)
-
-        if not durations:
+        if not daily_stats or not daily_stats.orders_count:
             return 40
 
-        return int(sum(durations) / len(durations))
+        return int(daily_stats.total_minutes / daily_stats.orders_count)
 
     def _calculate_final_estimated_time(
         self,
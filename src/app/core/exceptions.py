@@ -1,7 +1,11 @@
+import math
+
+
 class BusinessException(Exception):
     """Base exception for all business rule violations"""
     status_code: int = 400
     detail: str = "Business rule error"
+    headers: dict[str, str] | None = None
 
     def __init__(self, detail: str | None = None):
         if detail is not None:
@@ -40,6 +44,21 @@ class RequireAdminError(BusinessException):
     status_code = 401
 
 
+class TooManyLoginAttemptsError(BusinessException):
+    detail = "Too many login attempts, please try again later."
+    status_code = 429
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__()
+        if retry_after:
+            self.headers = {"Retry-After": str(math.ceil(retry_after))}
+
+
+class PasswordHasherBusyError(BusinessException):
+    detail = "Too many authentication requests, please try again later."
+    status_code = 503
+
+
 # Order Service Exceptions
 
 class OrderCancellationTimeExceededError(BusinessException):
@@ -77,6 +96,26 @@ class OrderEqualToZeroError(BusinessException):
     status_code = 400
 
 
+class InvalidOrderTransitionError(BusinessException):
+    detail = "The order is not in a status that allows this change."
+    status_code = 409
+
+
+class OrderVersionConflictError(BusinessException):
+    detail = "The order was changed by another request. Reload it and try again."
+    status_code = 409
+
+
+class InvalidCursorError(BusinessException):
+    detail = "The pagination cursor is invalid."
+    status_code = 400
+
+
+class InvalidExportRangeError(BusinessException):
+    detail = "The export range must end after it starts."
+    status_code = 400
+
+
 # Payment Service Exceptions
 
 class PaymentNotFoundError(BusinessException):
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Optional
+
+from app.db.models.schemas import OrderStatus
+
+
+@dataclass(frozen=True, slots=True)
+class OrderTransition:
+
+    """Statuses an order may move from into a target status, and the timestamp column it stamps."""
+
+    sources: FrozenSet[OrderStatus]
+    timestamp: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TransitionGuards:
+
+    """Conditions besides the source status that the order row must meet for a transition to apply."""
+
+    owner_id: Optional[int] = None
+    # Orders confirmed before this moment can no longer be canceled
+    confirmed_since: Optional[datetime] = None
+    expected_version: Optional[int] = None
+
+
+# PENDING -> AWAITING_CONFIRMATION -> PREPARING -> COMPLETED, and CANCELED from any open status
+ORDER_TRANSITIONS: Dict[OrderStatus, OrderTransition] = {
+    OrderStatus.AWAITING_CONFIRMATION: OrderTransition(
+        sources=frozenset({OrderStatus.PENDING}),
+    ),
+    OrderStatus.PREPARING: OrderTransition(
+        sources=frozenset({OrderStatus.AWAITING_CONFIRMATION}),
+        timestamp="confirmed_on",
+    ),
+    OrderStatus.COMPLETED: OrderTransition(
+        sources=frozenset({OrderStatus.PREPARING}),
+        timestamp="order_ready_in",
+    ),
+    OrderStatus.CANCELED: OrderTransition(
+        sources=frozenset({OrderStatus.PENDING, OrderStatus.AWAITING_CONFIRMATION, OrderStatus.PREPARING}),
+    ),
+}
+
+# How long after confirmation a customer may still cancel; admins always can
+CANCELLATION_WINDOW = timedelta(minutes=15)
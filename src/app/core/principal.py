@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Dict, Any
+
+from app.db.models.schemas import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+
+    """Authenticated user, resolved once per request by `verify_token`."""
+
+    id: int
+    name: str
+    email: str
+    active: bool
+    admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            active=user.active,
+            admin=user.admin,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "Principal":
+        return cls(
+            id=int(claims["sub"]),
+            name=claims.get("name"),
+            email=claims.get("email"),
+            active=bool(claims["active"]),
+            admin=claims["role"] == "admin",
+        )
+
+    @property
+    def claims(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "email": self.email,
+            "active": self.active,
+            "role": "admin" if self.admin else "customer",
+        }
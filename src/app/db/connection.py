@@ -1,30 +1,137 @@
-import os
+import time
+from typing import Any, Dict, Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.settings import DatabaseSettings, load_database_settings
 
 load_dotenv()
 
-APP_DATA_BASE = os.getenv("DATA_BASE_URL")
-DATA_BASE_URL = os.environ.get("DATA_BASE_URL_WORKER", APP_DATA_BASE)
 
-def get_engine() -> AsyncEngine:
-    return create_async_engine(
-        url=DATA_BASE_URL,
-        echo=True,
-        future=True
-    )
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+
+    """Queue pool that also measures how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _, settings: DatabaseSettings) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    cursor.close()
+
+
+class ReadOnlySession(Session):
+
+    """
+    Session of the read routes: there is never anything to flush or commit.
+
+    Refusing the flush is the only guard on SQLite; on PostgreSQL the session's
+    connections are also read-only (see `read_only`).
+    """
+
+    def flush(self, objects=None):
+        del objects  # Whatever the subset asked for, a pending write is an error
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Attempted to write through a read-only session.")
+
+
+def read_only(bound_engine: AsyncEngine) -> AsyncEngine:
+    # PostgreSQL runs every transaction of these connections as READ ONLY, so even a
+    # Core UPDATE is refused by the database; other backends rely on ReadOnlySession
+    if bound_engine.dialect.name == "postgresql":
+        return bound_engine.execution_options(postgresql_readonly=True)
+    return bound_engine
+
+
+def get_engine(settings: Optional[DatabaseSettings] = None, url: Optional[str] = None) -> AsyncEngine:
+    settings = settings or database_settings
+    url = make_url(url or settings.url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+
+    options: Dict[str, Any] = {"echo": settings.echo, "future": True}
+
+    # In-memory SQLite has to stay on its single shared connection
+    if not (is_sqlite and url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=settings.pool_pre_ping,
+        )
+
+    new_engine = create_async_engine(url, **options)
+
+    if is_sqlite:
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            _set_sqlite_pragmas(dbapi_connection, connection_record, settings)
+
+    return new_engine
+
+
+def pool_statistics(target_engine: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+    pool = (target_engine or engine).pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"status": pool.status()}
+
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.checkouts,
+        "avg_wait_ms": pool.total_wait / pool.checkouts * 1000 if pool.checkouts else 0.0,
+        "max_wait_ms": pool.max_wait * 1000,
+    }
+
+
+database_settings = load_database_settings()
+engine = get_engine(database_settings)
+read_engine = get_engine(database_settings, url=database_settings.read_url) if database_settings.read_url else engine
 
 # Fábrica de sessões assíncronas
 async_session = sessionmaker(
-    bind=get_engine(),
+    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False
 )
 
+read_session = sessionmaker(
+    bind=read_only(read_engine),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 async def get_database():
     session = async_session()
     try:
@@ -36,6 +143,14 @@ async def get_database():
     finally:
         await session.close()
 
+async def get_read_database():
+    # The read transaction starts on the first query and is simply released on close
+    session = read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
 @asynccontextmanager
 async def get_session_to_worker():
     session = async_session()
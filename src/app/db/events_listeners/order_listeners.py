@@ -1,26 +1,114 @@
-from sqlalchemy import event, select, func
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import event, bindparam, func
+from sqlalchemy.orm import Session, attributes, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 from app.db.models.schemas import Order, OrderItem
+from app.lib.order_cache import order_cache
 
 print("Registering order item event listeners.")
 
-def execute_order_item_event(_, connection, target):
-    order_id = target.order
+# order id -> price change accumulated by the current flush
+PRICE_DELTAS_KEY = "order_price_deltas"
+# ids of the orders written by the current transaction, evicted from the cache on commit
+CHANGED_ORDERS_KEY = "changed_orders"
+# Decimal places of Order.price; deltas and stored totals are rounded to them, as
+# SQLite keeps the column as a float and repeated additions would otherwise drift
+PRICE_SCALE = Order.price.type.scale
+PRICE_QUANTUM = Decimal(1).scaleb(-PRICE_SCALE)
+
+
+def mark_orders_changed(session: Session, order_ids: Iterable[int]) -> None:
+    # For writes that bypass the mapper events (bulk and Core statements)
+    session.info.setdefault(CHANGED_ORDERS_KEY, set()).update(order_ids)
+
+
+def _line_total(quantity: Any, unit_price: Any) -> Decimal:
+    if quantity is None or unit_price is None:
+        return Decimal(0)
+    return Decimal(str(unit_price)) * quantity
+
+
+def _committed_value(target: OrderItem, key: str) -> Any:
+    # Value the database still holds for the row, before this flush
+    history = attributes.get_history(target, key)
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+
+def _price_deltas(target: OrderItem) -> Dict[int, Decimal]:
+    return object_session(target).info.setdefault(PRICE_DELTAS_KEY, defaultdict(Decimal))
+
+
+def on_order_item_insert(_, __, target: OrderItem):
+    _price_deltas(target)[target.order] += _line_total(target.quantity, target.unit_price)
+    mark_orders_changed(object_session(target), [target.order])
+
 
-    subquery = (
-        select(func.sum(OrderItem.unit_price * OrderItem.quantity))
-        .where(OrderItem.order == order_id)
+def on_order_item_delete(_, __, target: OrderItem):
+    old_total = _line_total(_committed_value(target, "quantity"), _committed_value(target, "unit_price"))
+    _price_deltas(target)[_committed_value(target, "order")] -= old_total
+    mark_orders_changed(object_session(target), [_committed_value(target, "order")])
+
+
+def on_order_item_update(_, __, target: OrderItem):
+    deltas = _price_deltas(target)
+    # Moving an item to another order is a removal from one plus an addition to the other
+    deltas[_committed_value(target, "order")] -= _line_total(
+        _committed_value(target, "quantity"), _committed_value(target, "unit_price")
     )
+    deltas[target.order] += _line_total(target.quantity, target.unit_price)
+    mark_orders_changed(object_session(target), [_committed_value(target, "order"), target.order])
+
+
+def on_order_change(_, __, target: Order):
+    # Status changes, cancellation, estimated time, ...
+    mark_orders_changed(object_session(target), [target.id])
+
+
+def apply_order_price_deltas(session: Session, _):
+    deltas = session.info.pop(PRICE_DELTAS_KEY, None)
+    if not deltas:
+        return
 
-    total = connection.execute(subquery).scalar() or 0.0
+    rounded = {order_id: delta.quantize(PRICE_QUANTUM) for order_id, delta in deltas.items()}
+    changes = [{"order_id": order_id, "delta": delta} for order_id, delta in rounded.items() if delta]
+    if not changes:
+        return
 
-    update_query = (
+    # One `price = price + delta` per touched order, sent as a single executemany
+    session.connection().execute(
         Order.__table__.update()
-        .where(Order.id == order_id)
-        .values(price=total)
+        .where(Order.id == bindparam("order_id"))
+        .values(price=func.round(Order.price + bindparam("delta"), PRICE_SCALE)),
+        changes,
     )
 
-    connection.execute(update_query)
+    # Keep orders already loaded in this session in step without another SELECT
+    for change in changes:
+        order = session.identity_map.get(session.identity_key(Order, change["order_id"]))
+        if order is not None and "price" in order.__dict__:
+            price = Decimal(str(order.price or 0)) + change["delta"]
+            set_committed_value(order, "price", price.quantize(PRICE_QUANTUM))
+
+
+def evict_changed_orders(session: Session):
+    changed_orders = session.info.pop(CHANGED_ORDERS_KEY, None)
+    if changed_orders:
+        order_cache.invalidate(changed_orders)
+
+
+def discard_order_changes(session: Session, *_):
+    session.info.pop(PRICE_DELTAS_KEY, None)
+    session.info.pop(CHANGED_ORDERS_KEY, None)
+
 
-event.listen(OrderItem, 'after_insert', execute_order_item_event)
-event.listen(OrderItem, 'after_delete', execute_order_item_event)
-event.listen(OrderItem, 'after_update', execute_order_item_event)
+event.listen(OrderItem, 'after_insert', on_order_item_insert)
+event.listen(OrderItem, 'after_delete', on_order_item_delete)
+event.listen(OrderItem, 'after_update', on_order_item_update)
+event.listen(Order, 'after_update', on_order_change)
+event.listen(Order, 'after_delete', on_order_change)
+event.listen(Session, 'after_flush', apply_order_price_deltas)
+event.listen(Session, 'after_commit', evict_changed_orders)
+event.listen(Session, 'after_rollback', discard_order_changes)
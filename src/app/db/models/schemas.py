@@ -1,10 +1,10 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from enum import Enum
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
-from sqlalchemy import String, Integer, Boolean, ForeignKey, LargeBinary, Enum as SQLEnum, DateTime, Numeric
+from sqlalchemy import String, Integer, Boolean, ForeignKey, LargeBinary, Enum as SQLEnum, DateTime, Numeric, Index, Date, Float, SmallInteger, Text, text
 
 
 class Base(DeclarativeBase):
@@ -42,16 +42,30 @@ class OrderStatus(Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Leading `status` also serves plain status lookups, so it has no index of its own
+        Index(
+            "ix_orders_status_created_at",
+            "status",
+            "created_at",
+            postgresql_include=["id", "user", "price", "confirmed_on", "order_ready_in"],
+        ),
+        # Never reuse the id of a deleted (archived) row, which would collide in the archive table
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
-    status: Mapped[OrderStatus] = mapped_column(SQLEnum(OrderStatus), default=OrderStatus.PENDING, index=True)
+    status: Mapped[OrderStatus] = mapped_column(SQLEnum(OrderStatus), default=OrderStatus.PENDING)
     user: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), default=Decimal(0.00))
     created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: datetime.now(timezone.utc))
     confirmed_on: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     estimated_time: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     order_ready_in: Mapped[datetime] = mapped_column(DateTime, nullable=True)
-    items: Mapped[list["OrderItem"]] = relationship("OrderItem", backref="current_order", cascade="all, delete-orphan", lazy="selectin")
+    # Optimistic concurrency: every status transition increments it
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    # Items are never loaded implicitly: repository methods that serialize them ask for them
+    items: Mapped[list["OrderItem"]] = relationship("OrderItem", backref="current_order", cascade="all, delete-orphan", lazy="raise")
 
     @property
     def to_dict(self) -> Dict[str, Any]:
@@ -75,6 +89,7 @@ class ItemSize(Enum):
 class OrderItem(Base):
 
     __tablename__ = "order_item"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False, index=True)
     quantity: Mapped[int] = mapped_column(Integer)
@@ -89,7 +104,7 @@ class OrderItem(Base):
             "id": self.id,
             "quantity": self.quantity,
             "flavor": self.flavor,
-            "size": self.size,
+            "size": self.size.value,
             "unit_price": self.unit_price,
             "order": self.order,
         }
@@ -107,3 +122,153 @@ class Payment(Base):
     status: Mapped[PaymentStatus] = mapped_column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING)
     related_order: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
     amount_paid: Mapped[Decimal] = mapped_column(Numeric(10, 2), default=Decimal(0.00))
+
+
+# Closed orders moved out of the hot tables by the archival task. Same columns
+# as their hot counterparts (so rows copy with INSERT ... SELECT) plus archived_at;
+# no foreign keys back to the hot tables, whose rows are deleted.
+
+class ArchivedOrder(Base):
+    __tablename__ = "orders_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    status: Mapped[OrderStatus] = mapped_column(SQLEnum(OrderStatus))
+    user: Mapped[int] = mapped_column(Integer, index=True)
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    confirmed_on: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    estimated_time: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    order_ready_in: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class ArchivedOrderItem(Base):
+    __tablename__ = "order_item_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    quantity: Mapped[int] = mapped_column(Integer)
+    flavor: Mapped[str] = mapped_column(String(200))
+    size: Mapped[str] = mapped_column(SQLEnum(ItemSize))
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    order: Mapped[int] = mapped_column(ForeignKey("orders_archive.id"), index=True)
+
+
+class ArchivedPayment(Base):
+    __tablename__ = "payments_archive"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    status: Mapped[PaymentStatus] = mapped_column(SQLEnum(PaymentStatus))
+    related_order: Mapped[int] = mapped_column(ForeignKey("orders_archive.id"), index=True)
+    amount_paid: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+
+
+
+# Events recorded in the same transaction as the state change that raised them;
+# the outbox relay publishes the pending ones to Celery and stamps published_at.
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Only the pending rows, walked in insertion order by the relay
+        Index(
+            "ix_outbox_pending",
+            "id",
+            sqlite_where=text("published_at IS NULL"),
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    published_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+
+# Upper bounds (minutes) of the preparation-time histogram buckets; the last bucket is open-ended
+PREPARATION_BUCKETS = (5, 10, 15, 20, 25, 30, 40, 50, 60, 90, 120)
+PREPARATION_BUCKET_COLUMNS = (
+    *(f"le_{upper_bound}" for upper_bound in PREPARATION_BUCKETS),
+    f"gt_{PREPARATION_BUCKETS[-1]}",
+)
+
+
+class PreparationStatsMixin:
+
+    """Running aggregates of the preparation time (confirmation to readiness) of completed orders."""
+
+    orders_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    total_minutes_squared: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    min_minutes: Mapped[float] = mapped_column(Float, nullable=True)
+    max_minutes: Mapped[float] = mapped_column(Float, nullable=True)
+    le_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_10: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_15: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_20: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_25: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_30: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_40: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_50: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_60: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_90: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    le_120: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    gt_120: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @staticmethod
+    def bucket_column(minutes: float) -> str:
+        for upper_bound, column in zip(PREPARATION_BUCKETS, PREPARATION_BUCKET_COLUMNS):
+            if minutes <= upper_bound:
+                return column
+        return PREPARATION_BUCKET_COLUMNS[-1]
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        # Interpolated inside the histogram bucket holding the rank, clamped to the observed range
+        if not self.orders_count:
+            return None
+
+        rank = fraction * self.orders_count
+        seen = 0
+        lower_bound = 0.0
+        for upper_bound, column in zip((*PREPARATION_BUCKETS, self.max_minutes), PREPARATION_BUCKET_COLUMNS):
+            count = getattr(self, column)
+            if count and seen + count >= rank:
+                estimate = lower_bound + (upper_bound - lower_bound) * (rank - seen) / count
+                return min(max(estimate, self.min_minutes), self.max_minutes)
+            seen += count
+            lower_bound = float(upper_bound)
+
+        return self.max_minutes
+
+    @property
+    def to_dict(self) -> Dict[str, Any]:
+        mean = self.total_minutes / self.orders_count if self.orders_count else None
+        variance = (
+            max(self.total_minutes_squared / self.orders_count - mean * mean, 0.0)
+            if self.orders_count else None
+        )
+        return {
+            "orders": self.orders_count,
+            "mean_minutes": mean,
+            "stddev_minutes": variance ** 0.5 if variance is not None else None,
+            "min_minutes": self.min_minutes,
+            "max_minutes": self.max_minutes,
+            "p50_minutes": self.percentile(0.5),
+            "p90_minutes": self.percentile(0.9),
+        }
+
+
+class KitchenDailyStats(PreparationStatsMixin, Base):
+    __tablename__ = "kitchen_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+
+class KitchenHourlyStats(PreparationStatsMixin, Base):
+    __tablename__ = "kitchen_hourly_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    hour: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
@@ -0,0 +1,59 @@
+import os
+from typing import Literal, Optional
+
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DatabaseSettings(BaseSettings):
+
+    """Engine profile of the API process. Every field can be overridden with DB_<FIELD>."""
+
+    url: str = Field(validation_alias=AliasChoices("DB_URL", "DATA_BASE_URL"))
+    # Replica used by read-only sessions; falls back to `url` when unset
+    read_url: Optional[str] = None
+    echo: bool = False
+
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    # Only applied to SQLite connections
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000  # negative = KiB, so 64 MB
+    sqlite_busy_timeout: int = 5000
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="DB_",
+        extra="ignore",
+    )
+
+
+class WorkerDatabaseSettings(DatabaseSettings):
+
+    """Engine profile of the Celery worker. Every field can be overridden with DB_WORKER_<FIELD>."""
+
+    url: str = Field(validation_alias=AliasChoices("DB_WORKER_URL", "DATA_BASE_URL_WORKER", "DATA_BASE_URL"))
+
+    # Tasks share one engine in the worker process and few of them touch the database
+    pool_size: int = 5
+    max_overflow: int = 5
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="DB_WORKER_",
+        extra="ignore",
+    )
+
+
+def load_database_settings() -> DatabaseSettings:
+    # DB_PROFILE wins; otherwise the worker container is recognised by DATA_BASE_URL_WORKER
+    profile = os.getenv("DB_PROFILE") or ("worker" if os.getenv("DATA_BASE_URL_WORKER") else "app")
+    if profile == "worker":
+        return WorkerDatabaseSettings()
+    return DatabaseSettings()
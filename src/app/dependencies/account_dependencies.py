@@ -1,7 +1,7 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.connection import get_database
+from app.db.connection import get_database, get_read_database
 from app.repository.account_repository import AccountRepository
 from app.services.account.signin import SigninService
 from app.services.account.signup import SignupService
@@ -10,6 +10,9 @@ from app.services.account.signup import SignupService
 def get_account_repository(session: AsyncSession = Depends(get_database)) -> AccountRepository:
     return AccountRepository(session=session)
 
+def get_read_account_repository(session: AsyncSession = Depends(get_read_database)) -> AccountRepository:
+    return AccountRepository(session=session)
+
 def get_signin_service(account_repository: AccountRepository = Depends(get_account_repository)) -> SigninService:
     return SigninService(account_repository=account_repository)
 
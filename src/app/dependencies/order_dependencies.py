@@ -1,29 +1,55 @@
-from fastapi import Depends
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.connection import get_database
-from app.events.dispatcher import EventDispatcher
+from app.db.connection import get_database, get_read_database
 
 from app.services.orders.order import OrderService
 
 from app.repository.order_repository import OrderRepository
-from app.repository.account_repository import AccountRepository
-
-from app.dependencies.dispatcher_dependencies import get_event_dispatcher
-from app.dependencies.account_dependencies import get_account_repository
+from app.repository.kitchen_stats_repository import KitchenStatsRepository
+from app.repository.outbox_repository import OutboxRepository
 
 
 def get_order_repository(session: AsyncSession = Depends(get_database)) -> OrderRepository:
     return OrderRepository(session=session)
 
+def get_read_order_repository(session: AsyncSession = Depends(get_read_database)) -> OrderRepository:
+    return OrderRepository(session=session)
+
+def get_kitchen_stats_repository(session: AsyncSession = Depends(get_database)) -> KitchenStatsRepository:
+    return KitchenStatsRepository(session=session)
+
+def get_outbox_repository(session: AsyncSession = Depends(get_database)) -> OutboxRepository:
+    return OutboxRepository(session=session)
+
 def get_order_service(
     order_repository: OrderRepository = Depends(get_order_repository),
-    event_dispatcher: EventDispatcher = Depends(get_event_dispatcher),
-    account_repository: AccountRepository = Depends(get_account_repository)
+    kitchen_stats_repository: KitchenStatsRepository = Depends(get_kitchen_stats_repository),
+    outbox_repository: OutboxRepository = Depends(get_outbox_repository),
 ) -> OrderService:
 
     return OrderService(
-        account_repository=account_repository,
         order_repository=order_repository,
-        event_dispatcher=event_dispatcher,
+        outbox_repository=outbox_repository,
+        kitchen_stats_repository=kitchen_stats_repository,
     )
+
+def get_read_order_service(
+    order_repository: OrderRepository = Depends(get_read_order_repository),
+) -> OrderService:
+
+    return OrderService(order_repository=order_repository)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderListingParams:
+
+    """Query parameters of the list-orders route, resolved with `Depends()`."""
+
+    summary: bool = False
+    stream: bool = False
+    limit: int = Query(default=50, ge=1, le=500)
+    cursor: Optional[str] = None
@@ -5,21 +5,24 @@ from app.services.payments.payment import PaymentService
 from app.services.payments.webhook import WebHookService
 from app.repository.payment_repository import PaymentRepository
 
-from app.db.connection import get_database
-from app.dependencies.dispatcher_dependencies import get_event_dispatcher
-from app.events.dispatcher import EventDispatcher
+from app.db.connection import get_database, get_read_database
+from app.dependencies.order_dependencies import get_outbox_repository
+from app.repository.outbox_repository import OutboxRepository
 
 
 def get_payment_repository(session: AsyncSession = Depends(get_database)) -> PaymentRepository:
     return PaymentRepository(session=session)
 
+def get_read_payment_repository(session: AsyncSession = Depends(get_read_database)) -> PaymentRepository:
+    return PaymentRepository(session=session)
+
 def get_webhook_service(
-    event_dispatcher: EventDispatcher = Depends(get_event_dispatcher),
+    outbox_repository: OutboxRepository = Depends(get_outbox_repository),
     payment_repository: PaymentRepository = Depends(get_payment_repository),
 ) -> WebHookService:
 
     return WebHookService(
-        event_dispatcher=event_dispatcher,
+        outbox_repository=outbox_repository,
         payment_repository=payment_repository,
     )
 
@@ -28,3 +31,9 @@ def get_payment_service(
 ) -> PaymentService:
 
     return PaymentService(payment_repository=payment_repository)
+
+def get_read_payment_service(
+    payment_repository: PaymentRepository = Depends(get_read_payment_repository)
+) -> PaymentService:
+
+    return PaymentService(payment_repository=payment_repository)
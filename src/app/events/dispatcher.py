@@ -1,21 +1,184 @@
-from typing import Type, Callable, Dict, List
+import time
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
+from app.lib.metrics import EVENT_DISPATCH_DURATION, EVENT_HANDLER_CALLS, EVENT_HANDLER_DURATION, span
 
-class EventDispatcher:
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
-        self._handlers: Dict[str, List] = {}
 
-    def register_handler(self, event_type: Type, handler: Callable):
+@dataclass(frozen=True, slots=True)
+class HandlerRegistration:
 
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-        self._handlers[event_type].append(handler)
+    """A handler, whether it is a coroutine function or may block, and its own timeout (None for the dispatcher's)."""
 
-    async def dispatch(self, event):
+    handler: Callable[[Any], Any]
+    is_async: bool
+    timeout: Optional[float] = None
+    blocking: bool = True
 
-        event_type = type(event)
-        handlers = self._handlers.get(event_type, [])
 
-        for handler in handlers:
-            handler(event)
+@dataclass(frozen=True, slots=True)
+class DispatchResult:
+
+    """Return values of the handlers that completed, in resolution order, and how many did not."""
+
+    results: Tuple[Any, ...] = ()
+    failed: int = 0
+
+
+class EventDispatcher:  # pylint: disable=too-many-instance-attributes # pool settings, handler tables and counters
+
+    """
+    Runs every handler registered for an event's class or any of its base classes.
+
+    Async handlers run on the event loop; sync ones that may block (like a
+    Celery publish) run in a small thread pool, and sync ones registered with
+    `blocking=False` (pure functions) are called inline. The handlers of one event
+    run concurrently, each under its own timeout (inline calls have none), and a
+    failing or slow handler is logged without affecting the others or the caller;
+    `dispatch` returns what the handlers that completed returned, and how many
+    failed or timed out.
+
+    Handlers are resolved through the event class MRO once per class; the table
+    is rebuilt whenever a handler is registered.
+
+    Every handler call is counted by outcome and timed per event type and handler,
+    and recorded as a span when OpenTelemetry is available (see app.lib.metrics).
+    """
+
+    def __init__(self, max_workers: int = 4, timeout: float = 5.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._handlers: Dict[Type, List[HandlerRegistration]] = {}
+        self._resolved: Dict[Type, Tuple[HandlerRegistration, ...]] = {}
+        self.dispatched = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="event-handler",
+            )
+        return self._executor
+
+    def register_handler(
+        self,
+        event_type: Type,
+        handler: Callable,
+        timeout: Optional[float] = None,
+        blocking: bool = True,
+    ):
+
+        is_async = inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+            getattr(handler, "__call__", None)
+        )
+        self._handlers.setdefault(event_type, []).append(
+            HandlerRegistration(handler=handler, is_async=is_async, timeout=timeout, blocking=blocking)
+        )
+        self._rebuild()
+
+    async def dispatch(self, event) -> DispatchResult:
+
+        registrations = self._handlers_for(type(event))
+        if not registrations:
+            return DispatchResult()
+
+        event_type = type(event).__name__
+        self.dispatched += 1
+        started_at = time.perf_counter()
+        with span("event.dispatch", event_type=event_type, handlers=len(registrations)):
+            results = await asyncio.gather(
+                *(self._run(registration, event) for registration in registrations),
+                return_exceptions=True,
+            )
+        EVENT_DISPATCH_DURATION.labels(event_type).observe(time.perf_counter() - started_at)
+
+        completed = []
+        for registration, result in zip(registrations, results):
+            handler = _name(registration.handler)
+            if isinstance(result, asyncio.TimeoutError):
+                self.timed_out += 1
+                EVENT_HANDLER_CALLS.labels(event_type, handler, "timeout").inc()
+                logger.error("Handler %s timed out on %s.", handler, event_type)
+            elif isinstance(result, Exception):
+                self.failed += 1
+                EVENT_HANDLER_CALLS.labels(event_type, handler, "error").inc()
+                logger.error("Handler %s failed on %s.", handler, event_type, exc_info=result)
+            else:
+                EVENT_HANDLER_CALLS.labels(event_type, handler, "success").inc()
+                completed.append(result)
+
+        return DispatchResult(results=tuple(completed), failed=len(registrations) - len(completed))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "timeout": self.timeout,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+    async def _run(self, registration: HandlerRegistration, event) -> Any:
+        event_type = type(event).__name__
+        handler = _name(registration.handler)
+        started_at = time.perf_counter()
+
+        with span("event.handler", event_type=event_type, handler=handler):
+            try:
+                if registration.is_async:
+                    call = registration.handler(event)
+                elif not registration.blocking:
+                    # Nothing to wait for: no thread hop and no timeout
+                    return registration.handler(event)
+                else:
+                    # A timed-out sync handler keeps its thread until it returns; only the wait is abandoned
+                    call = asyncio.get_running_loop().run_in_executor(self.executor, registration.handler, event)
+
+                return await asyncio.wait_for(call, registration.timeout or self.timeout)
+            finally:
+                EVENT_HANDLER_DURATION.labels(event_type, handler).observe(time.perf_counter() - started_at)
+
+    def _handlers_for(self, event_type: Type) -> Tuple[HandlerRegistration, ...]:
+        registrations = self._resolved.get(event_type)
+        if registrations is None:
+            # A class defined after the last registration
+            registrations = self._resolved[event_type] = self._resolve(event_type)
+        return registrations
+
+    def _resolve(self, event_type: Type) -> Tuple[HandlerRegistration, ...]:
+        # Most specific class first, in registration order within each class
+        return tuple(
+            registration
+            for cls in event_type.__mro__
+            for registration in self._handlers.get(cls, ())
+        )
+
+    def _rebuild(self) -> None:
+        event_types = set()
+        pending = list(self._handlers)
+        while pending:
+            event_type = pending.pop()
+            if event_type not in event_types:
+                event_types.add(event_type)
+                pending.extend(event_type.__subclasses__())
+
+        self._resolved = {event_type: self._resolve(event_type) for event_type in event_types}
+
+
+def _name(handler: Callable) -> str:
+    return getattr(handler, "__qualname__", type(handler).__qualname__)
@@ -1,3 +1,12 @@
+import os
+
+from dotenv import load_dotenv
+
 from app.events.dispatcher import EventDispatcher
 
-dispatcher = EventDispatcher()
+load_dotenv()
+
+dispatcher = EventDispatcher(
+    max_workers=int(os.getenv("EVENT_HANDLER_WORKERS", "4")),
+    timeout=float(os.getenv("EVENT_HANDLER_TIMEOUT_SECONDS", "5")),
+)
@@ -1,4 +1,10 @@
+from typing import Callable, Dict, List, Type
+
+from celery.canvas import Signature
+
+from app.events.dispatcher import EventDispatcher
 from app.events.order_events import (
+    BaseOrderEvent,
     OrderConfirmedEvent,
     OrderReadyEvent,
     ConfirmPaidOrderEvent,
@@ -12,28 +18,49 @@ from tasks.emails.send_email import (
 )
 
 
-def order_confirmed_handler(event: OrderConfirmedEvent):
-    send_confirmation_email.delay({
-        "to": event.user_email,
-        "name": event.user_name,
-        "order_id": str(event.order_id)
-    })
-    estimate_order_time.delay({
-        "target_order": event.order
-    })
+def order_confirmed_tasks(event: OrderConfirmedEvent) -> List[Signature]:
+    return [
+        send_confirmation_email.s({
+            "to": event.user_email,
+            "name": event.user_name,
+            "order_id": str(event.order_id)
+        }),
+        estimate_order_time.s({
+            "target_order": event.order
+        }),
+    ]
+
+
+def order_ready_tasks(event: OrderReadyEvent) -> List[Signature]:
+    return [
+        send_order_ready_email.s({
+            "to": event.user_email,
+            "name": event.user_name,
+            "order_id": str(event.order_id)
+        }),
+    ]
+
+
+def order_confirm_paid_tasks(event: ConfirmPaidOrderEvent) -> List[Signature]:
+    return [
+        confirm_paid_order.s({
+            "to": event.user_email,
+            "name": event.user_name,
+            "order_id": str(event.order_id)
+        }),
+    ]
 
 
-def order_ready_handler(event: OrderReadyEvent):
-    send_order_ready_email.delay({
-        "to": event.user_email,
-        "name": event.user_name,
-        "order_id": str(event.order_id)
-    })
+# Celery tasks each event fans out to, published by the outbox relay
+EVENT_TASKS: Dict[Type[BaseOrderEvent], Callable[[BaseOrderEvent], List[Signature]]] = {
+    OrderConfirmedEvent: order_confirmed_tasks,
+    OrderReadyEvent: order_ready_tasks,
+    ConfirmPaidOrderEvent: order_confirm_paid_tasks,
+}
 
 
-def order_confirm_paid_handler(event: ConfirmPaidOrderEvent):
-    confirm_paid_order.delay({
-        "to": event.user_email,
-        "name": event.user_name,
-        "order_id": str(event.order_id)
-    })
+def register_order_handlers(dispatcher: EventDispatcher) -> None:
+    # Each handler only builds the signatures of its event's tasks, so it runs inline;
+    # the relay publishes them
+    for event_type, handler in EVENT_TASKS.items():
+        dispatcher.register_handler(event_type, handler, blocking=False)
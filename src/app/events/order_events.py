@@ -1,35 +1,70 @@
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, Optional, Type
 from datetime import datetime, timezone
 from uuid import uuid4
 
 
+@dataclass(frozen=True, slots=True)
 class BaseOrderEvent:
-    def __init__(
-        self,
-        user_email: str,
-        user_name: str,
-        order_id: int,
-        order: Optional[Dict[str, Any]] = None,
-    ):
-        self.id = str(uuid4())
-        self.timestamp = datetime.now(timezone.utc)
-        self.user_email = user_email
-        self.user_name = user_name
-        self.order_id = order_id
-        self.order = order
 
+    """
+    Immutable record of something that happened to an order.
 
+    The fields are the event's schema; `SCHEMA_VERSION` is bumped whenever they
+    change, and stored payloads carry it so older ones can still be read.
+    `order` is the `Order.to_dict` snapshot taken when the event was raised.
+    """
+
+    SCHEMA_VERSION: ClassVar[int] = 1
+
+    user_email: str
+    user_name: str
+    order_id: int
+    order: Optional[Dict[str, Any]] = None
+    id: str = field(default_factory=lambda: str(uuid4()))
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload = {event_field.name: getattr(self, event_field.name) for event_field in fields(self)}
+        payload["schema_version"] = self.SCHEMA_VERSION
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "BaseOrderEvent":
+        # Keeps the id and timestamp of the original event; payloads written before
+        # versioning have the version 1 fields
+        payload = dict(payload)
+        schema_version = payload.pop("schema_version", 1)
+        if schema_version > cls.SCHEMA_VERSION:
+            raise ValueError(
+                f"{cls.__name__} payload has schema version {schema_version}, "
+                f"newer than the supported {cls.SCHEMA_VERSION}."
+            )
+        return cls(**payload)
+
+
+@dataclass(frozen=True, slots=True)
 class OrderConfirmedEvent(BaseOrderEvent):
     pass
 
 
+@dataclass(frozen=True, slots=True)
 class OrderReadyEvent(BaseOrderEvent):
     pass
 
 
+@dataclass(frozen=True, slots=True)
 class ConfirmPaidOrderEvent(BaseOrderEvent):
     pass
 
 
+@dataclass(frozen=True, slots=True)
 class OrderPaymentFailedEvent(BaseOrderEvent):
     pass
+
+
+# Event classes by the name the outbox stores them under
+ORDER_EVENTS: Dict[str, Type[BaseOrderEvent]] = {
+    event_type.__name__: event_type
+    for event_type in (OrderConfirmedEvent, OrderReadyEvent, ConfirmPaidOrderEvent, OrderPaymentFailedEvent)
+}
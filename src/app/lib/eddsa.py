@@ -0,0 +1,80 @@
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+from jose.utils import base64url_encode
+
+
+class Ed25519Key(Key):  # pylint: disable=abstract-method # signing only; jose's Key raises for the encryption methods
+
+    """python-jose key for the EdDSA (Ed25519) algorithm, which jose does not ship."""
+
+    def __init__(self, key, algorithm):
+        if algorithm != "EdDSA":
+            raise JWKError(f"Ed25519Key does not support the {algorithm} algorithm")
+
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+
+        if isinstance(key, bytes):
+            try:
+                key = serialization.load_pem_private_key(key, password=None)
+            except ValueError:
+                key = serialization.load_pem_public_key(key)
+
+        if not isinstance(key, (Ed25519PrivateKey, Ed25519PublicKey)):
+            raise JWKError("The key is not an Ed25519 key")
+
+        self._key = key
+        self._algorithm = algorithm
+
+    def is_public(self) -> bool:
+        return isinstance(self._key, Ed25519PublicKey)
+
+    def sign(self, msg: bytes) -> bytes:
+        if self.is_public():
+            raise JWKError("A public Ed25519 key cannot sign")
+        return self._key.sign(msg)
+
+    def verify(self, msg: bytes, sig: bytes) -> bool:
+        public_key = self._key if self.is_public() else self._key.public_key()
+        try:
+            public_key.verify(sig, msg)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_key(self) -> "Ed25519Key":
+        if self.is_public():
+            return self
+        return Ed25519Key(self._key.public_key(), self._algorithm)
+
+    def to_pem(self) -> bytes:
+        if self.is_public():
+            return self._key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        return self._key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+    def to_dict(self) -> dict:
+        public_key = self._key if self.is_public() else self._key.public_key()
+        raw = public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw,
+        )
+        return {
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "alg": self._algorithm,
+            "x": base64url_encode(raw).decode("ascii"),
+        }
+
+
+jwk.register_key("EdDSA", Ed25519Key)
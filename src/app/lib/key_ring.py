@@ -0,0 +1,137 @@
+import os
+import time
+import logging
+from typing import Dict, Optional, Tuple
+
+from dotenv import dotenv_values, load_dotenv
+from jose import jwk, JWTError
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+import app.lib.eddsa  # pylint: disable=unused-import # registers the EdDSA key type in jose
+
+load_dotenv()
+
+SUPPORTED_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+# The only .env entries a reload takes over; the rest of the environment is left alone
+KEY_RING_VARIABLES = (
+    "JWT_ALGORITHM",
+    "JWT_KEY_ID",
+    "SECRET_JWT_PRIVATE_KEY",
+    "SECRET_JWT_PUBLIC_KEY",
+    "JWT_PREVIOUS_KEY_ID",
+    "JWT_PREVIOUS_ALGORITHM",
+    "SECRET_JWT_PREVIOUS_PUBLIC_KEY",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_pem_key(key_env_var: str) -> bytes:
+    """
+    Carrega a chave PEM de uma variável de ambiente e a formata
+    corretamente, garantindo que seja um objeto bytes.
+    """
+    key_str = os.getenv(key_env_var)
+    if not key_str:
+        raise ValueError(f"Environment variable {key_env_var} not found.")
+
+    # Esta linha é crucial para restaurar as quebras de linha em chaves PEM
+    key_str = key_str.strip().replace('\\n', '\n').replace('"', '')
+
+    return key_str.encode('utf-8')
+
+
+class JWTKeyRing:
+
+    """
+    Keeps the JWT keys parsed in memory, indexed by their key id (kid).
+
+    The PEM is only decoded when the ring is loaded or reloaded, so signing
+    and verifying a token only costs the signature operation itself.
+    A key rotation is picked up by calling `reload()` (SIGHUP in the API
+    process) or automatically when a token arrives signed with an unknown kid.
+
+    Each key is bound to its own algorithm, so during an algorithm migration
+    the previous key keeps validating its tokens (e.g. RS256) while new ones
+    are signed with the current key (e.g. ES256 or EdDSA).
+    """
+
+    def __init__(self, reload_interval: float = 30.0):
+        self.algorithm = "RS256"
+        self.reload_interval = reload_interval
+        self._signing_kid: Optional[str] = None
+        self._signing_key: Optional[Key] = None
+        self._verifying_keys: Dict[str, Tuple[str, Key]] = {}
+        self._last_reload = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._signing_key is not None
+
+    def load(self) -> None:
+        algorithm = _algorithm_from_env("JWT_ALGORITHM", "RS256")
+        signing_kid = os.getenv("JWT_KEY_ID", "primary")
+        signing_key = jwk.construct(load_pem_key("SECRET_JWT_PRIVATE_KEY"), algorithm)
+        verifying_keys = {
+            signing_kid: (algorithm, jwk.construct(load_pem_key("SECRET_JWT_PUBLIC_KEY"), algorithm)),
+        }
+
+        # Key being rotated out: still accepted until its tokens expire
+        previous_kid = os.getenv("JWT_PREVIOUS_KEY_ID")
+        if previous_kid:
+            previous_algorithm = _algorithm_from_env("JWT_PREVIOUS_ALGORITHM", algorithm)
+            verifying_keys[previous_kid] = (
+                previous_algorithm,
+                jwk.construct(load_pem_key("SECRET_JWT_PREVIOUS_PUBLIC_KEY"), previous_algorithm),
+            )
+
+        # Swap everything at once so a request never sees a half-loaded ring
+        self.algorithm, self._signing_kid, self._signing_key, self._verifying_keys = (
+            algorithm, signing_kid, signing_key, verifying_keys
+        )
+        self._last_reload = time.monotonic()
+
+    def reload(self) -> None:
+        """Re-read the key entries of the .env file and parse the keys again."""
+        self._last_reload = time.monotonic()
+        values = dotenv_values()
+        for name in KEY_RING_VARIABLES:
+            if values.get(name) is not None:
+                os.environ[name] = values[name]
+        try:
+            self.load()
+        except (ValueError, JWKError):
+            logger.exception("Could not reload the JWT key ring, keeping the current keys.")
+
+    def signing_key(self) -> Tuple[str, Key]:
+        if not self.loaded:
+            self.load()
+        return self._signing_kid, self._signing_key
+
+    def verifying_key(self, kid: Optional[str]) -> Tuple[str, Key]:
+        if not self.loaded:
+            self.load()
+
+        # Tokens issued before the key ring existed carry no kid
+        if kid is None:
+            return self._verifying_keys[self._signing_kid]
+
+        key = self._verifying_keys.get(kid)
+        if key is None and time.monotonic() - self._last_reload >= self.reload_interval:
+            self.reload()
+            key = self._verifying_keys.get(kid)
+
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+
+def _algorithm_from_env(env_var: str, default: str) -> str:
+    algorithm = os.getenv(env_var, default)
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"{env_var}={algorithm} is not one of {', '.join(SUPPORTED_ALGORITHMS)}.")
+    return algorithm
+
+
+key_ring = JWTKeyRing()
@@ -0,0 +1,83 @@
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict
+
+from prometheus_client import Counter, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+
+try:
+    # Optional: spans are only recorded when the OpenTelemetry API is installed and configured
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+EVENT_HANDLER_CALLS = Counter(
+    "event_handler_calls_total",
+    "Event handler calls by event type, handler and outcome (success, error, timeout).",
+    ["event_type", "handler", "outcome"],
+)
+EVENT_HANDLER_DURATION = Histogram(
+    "event_handler_duration_seconds",
+    "Time from scheduling an event handler to its completion, timeouts included.",
+    ["event_type", "handler"],
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_DISPATCH_DURATION = Histogram(
+    "event_dispatch_duration_seconds",
+    "Time the caller of EventDispatcher.dispatch waits for all the handlers of an event.",
+    ["event_type"],
+    buckets=LATENCY_BUCKETS,
+)
+
+OUTBOX_MESSAGES = Counter(
+    "outbox_messages_total",
+    "Outbox messages handled by the relay, by event type and outcome (published, failed).",
+    ["event_type", "outcome"],
+)
+OUTBOX_TASKS = Counter(
+    "outbox_tasks_total",
+    "Celery tasks the relay published, by event type, task and outcome (published, failed).",
+    ["event_type", "task", "outcome"],
+)
+OUTBOX_PUBLISH_DURATION = Histogram(
+    "outbox_publish_duration_seconds",
+    "Time to publish one outbox batch to the broker as a Celery group.",
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOX_BATCH_MESSAGES = Histogram(
+    "outbox_batch_messages",
+    "Messages claimed per outbox relay batch.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+_tracer = trace.get_tracer("delivery_api") if trace is not None else None
+
+
+def span(name: str, **attributes: Any) -> ContextManager:
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+class StatsCollector:
+
+    """Exposes the numeric fields of a component's `stats()` as gauges, read at scrape time."""
+
+    def __init__(self, prefix: str, stats: Callable[[], Dict[str, Any]]):
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self):
+        for key, value in self.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key.replace('_', ' ')}", value=value)
+
+    def describe(self):
+        # Nothing to check against other collectors up front; the stats are only read on scrape
+        return []
+
+
+def register_stats(prefix: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    REGISTRY.register(StatsCollector(prefix, stats))
@@ -0,0 +1,58 @@
+import struct
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+import msgpack
+
+
+# Celery/kombu name and content type of this format (see tasks.celery_app)
+SERIALIZER_NAME = "typed-msgpack"
+CONTENT_TYPE = "application/x-typed-msgpack"
+
+# msgpack extension type codes
+DECIMAL_EXT = 1
+DATETIME_EXT = 2
+DATE_EXT = 3
+
+_EPOCH = datetime(1970, 1, 1)
+# Microseconds since the epoch, then whether the value was timezone-aware (as UTC)
+_DATETIME = struct.Struct(">q?")
+_DATE = struct.Struct(">i")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Exact digits, not a float: prices must come back as they went in
+        return msgpack.ExtType(DECIMAL_EXT, str(value).encode("ascii"))
+    if isinstance(value, datetime):
+        aware = value.tzinfo is not None
+        naive = value.astimezone(timezone.utc).replace(tzinfo=None) if aware else value
+        return msgpack.ExtType(DATETIME_EXT, _DATETIME.pack((naive - _EPOCH) // timedelta(microseconds=1), aware))
+    if isinstance(value, date):
+        return msgpack.ExtType(DATE_EXT, _DATE.pack(value.toordinal()))
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == DECIMAL_EXT:
+        return Decimal(data.decode("ascii"))
+    if code == DATETIME_EXT:
+        microseconds, aware = _DATETIME.unpack(data)
+        value = _EPOCH + timedelta(microseconds=microseconds)
+        return value.replace(tzinfo=timezone.utc) if aware else value
+    if code == DATE_EXT:
+        return date.fromordinal(_DATE.unpack(data)[0])
+    return msgpack.ExtType(code, data)
+
+
+def dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def loads(data: bytes) -> Any:
+    # strict_map_key=False keeps maps with non-string keys (e.g. ids) readable
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
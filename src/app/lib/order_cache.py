@@ -0,0 +1,170 @@
+import os
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.schemas.order_schemas import OrderSchema
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class OrderCacheBackend(ABC):
+
+    """
+    Shared second level of the order cache.
+
+    Nothing is shared by default; subclass this with a store every API process
+    and the worker can reach (e.g. Redis), so a change committed by one process
+    is evicted from the shared tier at once. The other processes' local copies
+    are not: they keep serving them for up to the cache `ttl`.
+    """
+
+    @abstractmethod
+    async def get(self, order_id: int) -> Optional[OrderSchema]:
+        ...
+
+    @abstractmethod
+    async def set(self, order_id: int, order: OrderSchema, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, order_ids: Iterable[int]) -> None:
+        ...
+
+
+class OrderCache:  # pylint: disable=too-many-instance-attributes # settings, two tiers and their counters
+
+    """
+    Read-through cache of serialized orders: an in-process LRU with TTL in front
+    of an optional shared backend.
+
+    Writers never touch it directly. The order listeners collect the ids changed
+    in a transaction and call `invalidate` once it commits. A load that started
+    before the latest invalidation of its order is returned but not cached.
+
+    Only this process's commits invalidate the local entries, so with several
+    processes a read may be up to `ttl` seconds stale. Reads that must be
+    current, such as the price charged at checkout, bypass the cache.
+    """
+
+    # Invalidation times are kept this long, which must outlast any single load
+    INVALIDATION_MEMORY = 60.0
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 30.0, backend: Optional[OrderCacheBackend] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[int, Tuple[float, OrderSchema]]" = OrderedDict()
+        self._invalidated_at: Dict[int, float] = {}
+
+    async def get_or_load(
+        self,
+        order_id: int,
+        loader: Callable[[], Awaitable[Optional[OrderSchema]]],
+    ) -> Optional[OrderSchema]:
+
+        order = self._get_local(order_id)
+        if order is not None:
+            self.hits += 1
+            return order
+
+        started_at = time.monotonic()
+
+        if self.backend is not None:
+            order = await self.backend.get(order_id)
+            if order is not None:
+                self.shared_hits += 1
+                self._set_local(order_id, order, started_at)
+                return order
+
+        self.misses += 1
+        order = await loader()
+        if order is not None and self._set_local(order_id, order, started_at) and self.backend is not None:
+            await self.backend.set(order_id, order, self.ttl)
+
+        return order
+
+    def invalidate(self, order_ids: Iterable[int]) -> None:
+        order_ids = set(order_ids)
+        now = time.monotonic()
+        for order_id in order_ids:
+            self._invalidated_at[order_id] = now
+            self._entries.pop(order_id, None)
+            self.invalidations += 1
+
+        if len(self._invalidated_at) > self.max_size:
+            self._invalidated_at = {
+                order_id: invalidated_at for order_id, invalidated_at in self._invalidated_at.items()
+                if invalidated_at > now - self.INVALIDATION_MEMORY
+            }
+
+        if self.backend is not None and order_ids:
+            # Called from the synchronous after_commit hook; the shared delete runs on the loop
+            try:
+                task = asyncio.get_running_loop().create_task(self.backend.delete(order_ids))
+                task.add_done_callback(self._log_backend_failure)
+            except RuntimeError:
+                logger.warning("No running loop to evict orders %s from the shared cache.", sorted(order_ids))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def _get_local(self, order_id: int) -> Optional[OrderSchema]:
+        entry = self._entries.get(order_id)
+        if entry is None:
+            return None
+
+        expires_at, order = entry
+        if expires_at <= time.monotonic():
+            del self._entries[order_id]
+            return None
+
+        self._entries.move_to_end(order_id)
+        return order
+
+    def _set_local(self, order_id: int, order: OrderSchema, loaded_since: float) -> bool:
+        if self._invalidated_at.get(order_id, float("-inf")) >= loaded_since:
+            return False
+
+        self._entries[order_id] = (time.monotonic() + self.ttl, order)
+        self._entries.move_to_end(order_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    @staticmethod
+    def _log_backend_failure(task: "asyncio.Task") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Shared order cache eviction failed.", exc_info=task.exception())
+
+
+order_cache = OrderCache(
+    max_size=int(os.getenv("ORDER_CACHE_MAX_SIZE", "10000")),
+    ttl=float(os.getenv("ORDER_CACHE_TTL_SECONDS", "30")),
+)
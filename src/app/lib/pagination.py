@@ -0,0 +1,28 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.exceptions import InvalidCursorError
+
+
+# Keyset position of a listing: the (created_at, id) of the last row of the previous page.
+# Opaque to clients, who only ever send back the `next_cursor` they were given.
+Keyset = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Keyset]:
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError() from exc
@@ -0,0 +1,102 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bcrypt import checkpw, hashpw, gensalt
+from dotenv import load_dotenv
+
+from app.core.exceptions import PasswordHasherBusyError
+
+load_dotenv()
+
+
+class PasswordHasher:  # pylint: disable=too-many-instance-attributes # pool settings plus its counters
+
+    """
+    Runs bcrypt in a dedicated thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL while it works, so the threads hash in parallel.
+    Once `max_pending` operations are queued or running, new ones are rejected
+    right away with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    async def hash(self, password: str, rounds: int = 8) -> bytes:
+        return await self._submit(hashpw, password.encode("utf-8"), gensalt(rounds))
+
+    async def check(self, password: str, hashed_password: bytes) -> bool:
+        return await self._submit(checkpw, password.encode("utf-8"), hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": self._total_wait / self.completed * 1000 if self.completed else 0.0,
+            "max_wait_ms": self._max_wait * 1000,
+            "avg_run_ms": self._total_run / self.completed * 1000 if self.completed else 0.0,
+        }
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyError()
+
+        self._pending += 1
+        submitted_at = time.perf_counter()
+        try:
+            result, started_at, finished_at = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._run, func, args
+            )
+        finally:
+            self._pending -= 1
+
+        # Metrics are only touched here, on the event loop thread
+        wait = started_at - submitted_at
+        self.completed += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._total_run += finished_at - started_at
+        return result
+
+    @staticmethod
+    def _run(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float, float]:
+        started_at = time.perf_counter()
+        result = func(*args)
+        return result, started_at, time.perf_counter()
+
+
+_workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+password_hasher = PasswordHasher(
+    max_workers=_workers,
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(_workers * 8))),
+)
@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.core.exceptions import TooManyLoginAttemptsError
+
+load_dotenv()
+
+
+class RateLimitBackend(ABC):
+
+    """
+    Storage of the token buckets.
+
+    The in-memory backend is per process; subclass this with a shared store
+    (e.g. Redis with a Lua script) so several workers enforce the same limits.
+
+    `consume` returns 0 when the tokens were taken, otherwise the seconds until
+    the bucket holds enough of them again.
+    """
+
+    @abstractmethod
+    async def consume(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> float:
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+
+    """
+    Token buckets kept in dicts split into shards, each with its own lock,
+    so concurrent checks on different keys never wait on each other.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 50_000):
+        self.max_keys_per_shard = max_keys_per_shard
+        # key -> (tokens, updated_at, full_at)
+        self._shards: List[Tuple[threading.Lock, Dict[str, Tuple[float, float, float]]]] = [
+            (threading.Lock(), {}) for _ in range(shards)
+        ]
+
+    async def consume(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> float:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+
+        with lock:
+            tokens, updated_at, _ = buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+            if len(buckets) > self.max_keys_per_shard:
+                self._drop_full_buckets(buckets, now)
+
+        return 0.0 if allowed else (cost - tokens) / refill_rate
+
+    @staticmethod
+    def _drop_full_buckets(buckets: Dict[str, Tuple[float, float, float]], now: float) -> None:
+        # A bucket that has refilled completely behaves exactly like a missing one
+        for key in [key for key, (_, _, full_at) in buckets.items() if full_at <= now]:
+            del buckets[key]
+
+
+class LoginRateLimiter:
+
+    """Per-IP and per-email token buckets checked before any database or bcrypt work."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        *,
+        ip_burst: float,
+        ip_refill_rate: float,
+        email_burst: float,
+        email_refill_rate: float,
+    ):
+        self.backend = backend
+        self.ip_burst = ip_burst
+        self.ip_refill_rate = ip_refill_rate
+        self.email_burst = email_burst
+        self.email_refill_rate = email_refill_rate
+
+    async def check(self, ip: Optional[str], email: Optional[str]) -> None:
+        if ip:
+            retry_after = await self.backend.consume(f"login:ip:{ip}", self.ip_burst, self.ip_refill_rate)
+            if retry_after:
+                raise TooManyLoginAttemptsError(retry_after=retry_after)
+
+        if email:
+            retry_after = await self.backend.consume(
+                f"login:email:{email.lower()}", self.email_burst, self.email_refill_rate
+            )
+            if retry_after:
+                raise TooManyLoginAttemptsError(retry_after=retry_after)
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend=InMemoryRateLimitBackend(),
+    ip_burst=float(os.getenv("LOGIN_RATE_LIMIT_IP_BURST", "20")),
+    ip_refill_rate=float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_SECOND", "0.5")),
+    email_burst=float(os.getenv("LOGIN_RATE_LIMIT_EMAIL_BURST", "5")),
+    email_refill_rate=float(os.getenv("LOGIN_RATE_LIMIT_EMAIL_PER_SECOND", "0.1")),
+)
@@ -0,0 +1,64 @@
+import os
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class RevocationDenylist:
+
+    """
+    In-memory denylist used when tokens are authorized from their own claims.
+
+    A revoked token id (jti) is only kept until the token would have expired anyway.
+    A revoked user is kept for `user_ttl` seconds (the longest token lifetime) and
+    every token issued to them up to the revocation is rejected.
+    """
+
+    def __init__(self, user_ttl: float, purge_every: int = 1024):
+        self.user_ttl = user_ttl
+        self.purge_every = purge_every
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, float] = {}
+        self._writes = 0
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        self._tokens[jti] = expires_at
+        self._after_write()
+
+    def revoke_user(self, user_id: int | str, revoked_at: Optional[float] = None) -> None:
+        self._users[str(user_id)] = revoked_at if revoked_at is not None else time.time()
+        self._after_write()
+
+    def is_revoked(self, jti: Optional[str], user_id: str, issued_at: float) -> bool:
+        now = time.time()
+
+        expires_at = self._tokens.get(jti) if jti else None
+        if expires_at is not None and expires_at > now:
+            return True
+
+        revoked_at = self._users.get(str(user_id))
+        return revoked_at is not None and issued_at <= revoked_at and now < revoked_at + self.user_ttl
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def _after_write(self) -> None:
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self.purge()
+
+    def purge(self) -> None:
+        now = time.time()
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {
+            user_id: revoked_at for user_id, revoked_at in self._users.items()
+            if revoked_at + self.user_ttl > now
+        }
+
+
+revocation_denylist = RevocationDenylist(
+    user_ttl=int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 60 * 60,
+)
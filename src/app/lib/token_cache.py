@@ -0,0 +1,104 @@
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from app.core.principal import Principal
+
+load_dotenv()
+
+
+class VerifiedTokenCache:
+
+    """
+    LRU of bearer tokens that already passed signature verification and the user lookup.
+
+    Entries are keyed by the SHA-256 of the token, so the raw token is never kept
+    in memory. They expire at the token's own `exp` claim or after `max_ttl`
+    seconds, whichever comes first, so a change to the user's active or admin flag
+    is picked up within `max_ttl` even if nothing calls `invalidate_user`. Revoked
+    tokens must be dropped through `invalidate_token`.
+    """
+
+    def __init__(self, max_size: int = 10_000, max_ttl: float = 60.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, str, Principal]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[bytes]] = {}
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Tuple[str, Principal]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user_id, principal = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user_id, principal
+
+    def set(self, token: str, user_id: str, principal: Principal, expires_at: float) -> None:
+        key = self._key(token)
+        self._remove(key)
+        self._entries[key] = (min(expires_at, time.time() + self.max_ttl), user_id, principal)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        self._remove(self._key(token))
+
+    def invalidate_user(self, user_id: int | str) -> None:
+        for key in self._keys_by_user.pop(str(user_id), set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "max_ttl": self.max_ttl,
+        }
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        user_keys = self._keys_by_user.get(entry[1])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[1]]
+
+
+token_cache = VerifiedTokenCache(
+    max_size=int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000")),
+    max_ttl=float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "60")),
+)
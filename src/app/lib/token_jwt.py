@@ -1,4 +1,6 @@
 import os
+from uuid import uuid4
+from typing import Dict, Any
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, Request
@@ -6,10 +8,16 @@ from fastapi import Depends, Request
 from jose import jwt, JWTError
 from dotenv import load_dotenv
 
-from app.dependencies.account_dependencies import get_account_repository
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_read_database
 from app.repository.account_repository import AccountRepository
 
 from app.core.security import oauth2_schema
+from app.core.principal import Principal
+from app.lib.key_ring import key_ring
+from app.lib.token_cache import token_cache
+from app.lib.revocation import revocation_denylist
 from app.core.exceptions import (
     InvalidAccessTokenError,
     AccessDeniedError,
@@ -18,48 +26,43 @@ from app.core.exceptions import (
 
 load_dotenv()
 
-async def load_pem_key(key_env_var: str) -> bytes:
-    """
-    Carrega a chave PEM de uma variável de ambiente e a formata
-    corretamente para PyJWT, garantindo que seja um objeto bytes.
-    """
-    key_str = os.getenv(key_env_var)
-    if not key_str:
-        raise ValueError(f"Environment variable {key_env_var} not found.")
-
-    # Esta linha é crucial para restaurar as quebras de linha em chaves PEM
-    key_str = key_str.strip().replace('\\n', '\n').replace('"', '')
-
-    return key_str.encode('utf-8')
+# When enabled, tokens carry the role and the active flag and verify_token
+# authorizes from the claims alone, without reading the users table.
+STATELESS_CLAIMS = os.getenv("JWT_STATELESS_CLAIMS", "false").lower() == "true"
 
 async def signin_access_token(
-    user_id: str,
+    principal: Principal,
     token_duration=timedelta(minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))),
 ):
     now = datetime.now(timezone.utc)
     payload = {
-        "sub": str(user_id),
+        "sub": str(principal.id),
+        "jti": uuid4().hex,
         "iss": os.getenv("ISSUER"),
         "iat": int(now.timestamp()),
         "exp": now + token_duration
     }
+    if STATELESS_CLAIMS:
+        payload.update(principal.claims)
 
-    private_key = await load_pem_key("SECRET_JWT_PRIVATE_KEY")
+    kid, private_key = key_ring.signing_key()
 
     access_token = jwt.encode(
         claims=payload,
         key=private_key,
-        algorithm="RS256",
+        algorithm=key_ring.algorithm,
+        headers={"kid": kid},
     )
     return access_token
 
 
-async def validate_access_token(token_jwt: str):
-    public_key = await load_pem_key("SECRET_JWT_PUBLIC_KEY")
+async def decode_access_token(token_jwt: str) -> Dict[str, Any]:
+    header = jwt.get_unverified_header(token_jwt)
+    algorithm, public_key = key_ring.verifying_key(header.get("kid"))
     payload_data = jwt.decode(
         token=token_jwt,
         key=public_key,
-        algorithms=["RS256"],
+        algorithms=[algorithm],
         options={
             "verify_signature": True,
             "verify_aud": False, # Não estamos usando 'aud' (audience)
@@ -67,29 +70,73 @@ async def validate_access_token(token_jwt: str):
             "require_iss": True, # O 'iss' é obrigatório
         },
     )
+    return payload_data
+
+
+async def validate_access_token(token_jwt: str):
+    payload_data = await decode_access_token(token_jwt=token_jwt)
     return payload_data["sub"]
 
 async def verify_token(
     request: Request,
     token: str = Depends(oauth2_schema),
-    account_repository: AccountRepository = Depends(get_account_repository),
+    session: AsyncSession = Depends(get_read_database),
 ) -> str:
-    try:
-        user_id = await validate_access_token(token_jwt=token)
-        get_user = await account_repository.get_account_by_id(int(user_id))
-        if not get_user:
-            raise AccessDeniedError()
+    cached = token_cache.get(token)
+    if cached:
+        user_id, request.state.principal = cached
+        return user_id
 
-        request.state.user = get_user.to_dict_necessary_attributes
+    try:
+        payload_data = await decode_access_token(token_jwt=token)
+        user_id = payload_data["sub"]
+        if revocation_denylist.is_revoked(payload_data.get("jti"), user_id, payload_data["iat"]):
+            raise InvalidAccessTokenError()
+
+        if STATELESS_CLAIMS and "role" in payload_data:
+            principal = Principal.from_claims(payload_data)
+            if not principal.active:
+                raise AccessDeniedError()
+        else:
+            account_repository = AccountRepository(session=session)
+            get_user = await account_repository.get_account_by_id(int(user_id))
+            if not get_user:
+                raise AccessDeniedError()
+            principal = Principal.from_user(get_user)
+
+        request.state.principal = principal
+        token_cache.set(
+            token=token,
+            user_id=user_id,
+            principal=request.state.principal,
+            expires_at=payload_data["exp"],
+        )
         return user_id
     except JWTError as exc:
         raise InvalidAccessTokenError() from exc
 
+def revoke_access_token(token: str) -> None:
+    """Logout: reject this token from now on. Expects a token already checked by verify_token."""
+    payload_data = jwt.get_unverified_claims(token)
+    if payload_data.get("jti"):
+        revocation_denylist.revoke_token(payload_data["jti"], payload_data["exp"])
+    token_cache.invalidate_token(token)
+
+def revoke_user_tokens(user_id: int) -> None:
+    """Deactivation: reject every token issued to the user so far."""
+    revocation_denylist.revoke_user(user_id)
+    token_cache.invalidate_user(user_id)
+
+async def get_current_principal(
+    request: Request,
+    _: str = Depends(verify_token),
+) -> Principal:
+    return request.state.principal
+
 async def require_admin(
-    user_id: str = Depends(verify_token),
-    account_repository: AccountRepository = Depends(get_account_repository),
-) -> None:
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
 
-    user = await account_repository.get_account_by_id(int(user_id))
-    if not user.admin:
+    if not principal.admin:
         raise RequireAdminError()
+    return principal
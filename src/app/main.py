@@ -1,34 +1,55 @@
 #pylint: disable=wildcard-import, redefined-outer-name, unused-import, unused-argument, unused-wildcard-import
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import os
+import signal
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from prometheus_client import start_http_server
 
 from app.routers.auth_router import auth_router
 from app.routers.order_router import order_router
 from app.routers.payment_router import payment_router
 from app.db.events_listeners.order_listeners import * # to register the event listeners
+from app.db.connection import pool_statistics
+from app.lib.key_ring import key_ring
+from app.lib.metrics import register_stats
+from app.lib.order_cache import order_cache
+from app.lib.password_hasher import password_hasher
+from app.lib.token_cache import token_cache
+from app.core.exceptions import BusinessException
 
-from app.events.dispatcher_instance import dispatcher
-from app.events.handlers.order_handlers import (
-    order_confirmed_handler,
-    order_ready_handler,
-    order_confirm_paid_handler,
-)
-from app.events.order_events import (
-    OrderConfirmedEvent,
-    OrderReadyEvent,
-    ConfirmPaidOrderEvent,
-)
+logger = logging.getLogger(__name__)
+
+# Prometheus endpoint on its own port, kept off the public API port; 0 disables it
+API_METRICS_PORT = int(os.getenv("API_METRICS_PORT", "9101"))
+
+register_stats("order_cache", order_cache.stats)
+register_stats("token_cache", token_cache.stats)
+register_stats("password_hasher", password_hasher.stats)
+register_stats("db_pool", pool_statistics)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
-    dispatcher.register_handler(OrderConfirmedEvent, order_confirmed_handler)
-    dispatcher.register_handler(OrderReadyEvent, order_ready_handler)
-    dispatcher.register_handler(ConfirmPaidOrderEvent, order_confirm_paid_handler)
+    # Parse the JWT keys once; `kill -HUP` reloads them after a rotation
+    key_ring.load()
+    with suppress(NotImplementedError, AttributeError, RuntimeError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, key_ring.reload)
+
+    if API_METRICS_PORT:
+        try:
+            start_http_server(API_METRICS_PORT)
+        except OSError:
+            # Several workers: the first one to start serves its own metrics
+            logger.warning("Metrics port %s is already in use, not serving metrics.", API_METRICS_PORT)
 
     yield
 
+    password_hasher.shutdown()
+
 app = FastAPI(
     title="Delivery API",
     description="API for managing orders, payments and delivery of a food delivery service.",
@@ -38,6 +59,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+@app.exception_handler(BusinessException)
+async def business_exception_handler(_: Request, exc: BusinessException) -> JSONResponse:
+    # Business rule violations carry their own status code (400, 409, 429, 503, ...)
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+
+
 app.include_router(order_router)
 app.include_router(auth_router)
 app.include_router(payment_router)
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from typing import List, Sequence
+
+from sqlalchemy import select, delete, insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.schemas import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    Payment,
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedPayment,
+)
+from app.db.events_listeners.order_listeners import mark_orders_changed
+
+# Orders that can no longer change
+CLOSED_ORDER_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELED)
+
+
+class ArchiveRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def select_archivable_order_ids(self, cutoff: datetime, limit: int) -> List[int]:
+        result = await self.session.execute(
+            select(Order.id)
+            .where(Order.status.in_(CLOSED_ORDER_STATUSES), Order.created_at < cutoff)
+            .order_by(Order.created_at, Order.id)
+            .limit(limit)
+            # Concurrent archivers take disjoint batches on PostgreSQL; ignored by SQLite
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars())
+
+    async def archive_orders(self, order_ids: Sequence[int]) -> int:
+        if not order_ids:
+            return 0
+
+        archived_at = datetime.now(timezone.utc)
+
+        # Copied and deleted with set-based Core statements: six statements per batch,
+        # whatever its size, and no ORM objects (or item listeners) involved
+        await self.session.execute(
+            insert(ArchivedOrder).from_select(
+                [*self._copied_columns(Order), "archived_at"],
+                select(*self._source_columns(Order), literal(archived_at, ArchivedOrder.archived_at.type))
+                .where(Order.id.in_(order_ids)),
+            )
+        )
+        await self.session.execute(
+            insert(ArchivedOrderItem).from_select(
+                self._copied_columns(OrderItem),
+                select(*self._source_columns(OrderItem)).where(OrderItem.order.in_(order_ids)),
+            )
+        )
+        await self.session.execute(
+            insert(ArchivedPayment).from_select(
+                self._copied_columns(Payment),
+                select(*self._source_columns(Payment)).where(Payment.related_order.in_(order_ids)),
+            )
+        )
+
+        await self.session.execute(delete(Payment.__table__).where(Payment.related_order.in_(order_ids)))
+        await self.session.execute(delete(OrderItem.__table__).where(OrderItem.order.in_(order_ids)))
+        result = await self.session.execute(delete(Order.__table__).where(Order.id.in_(order_ids)))
+
+        # Cached copies are evicted on commit; the next read falls back to the archive
+        mark_orders_changed(self.session.sync_session, order_ids)
+
+        return result.rowcount
+
+    @staticmethod
+    def _copied_columns(model) -> List[str]:
+        return [column.name for column in model.__table__.columns]
+
+    @staticmethod
+    def _source_columns(model) -> list:
+        return list(model.__table__.columns)
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.schemas import (
+    PREPARATION_BUCKET_COLUMNS,
+    KitchenDailyStats,
+    KitchenHourlyStats,
+    PreparationStatsMixin,
+)
+
+
+class KitchenStatsRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_preparation(self, ready_at: datetime, minutes: float) -> None:
+
+        # One upsert per granularity; concurrent completions add up inside the database
+        await self.session.execute(self._upsert(KitchenDailyStats, {"day": ready_at.date()}, minutes))
+        await self.session.execute(
+            self._upsert(KitchenHourlyStats, {"day": ready_at.date(), "hour": ready_at.hour}, minutes)
+        )
+
+    async def get_daily_stats(self, day: date) -> Optional[KitchenDailyStats]:
+        return await self.session.get(KitchenDailyStats, day)
+
+    async def get_hourly_stats(self, day: date, hour: int) -> Optional[KitchenHourlyStats]:
+        return await self.session.get(KitchenHourlyStats, (day, hour))
+
+    def _upsert(self, model: Type[PreparationStatsMixin], keys: Dict[str, Any], minutes: float):
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            insert, smallest, largest = postgresql.insert, func.least, func.greatest
+        elif dialect == "sqlite":
+            insert, smallest, largest = sqlite.insert, func.min, func.max
+        else:
+            raise NotImplementedError(f"Kitchen statistics have no upsert for the {dialect} dialect.")
+
+        table = model.__table__
+        bucket = model.bucket_column(minutes)
+
+        statement = insert(table).values(
+            **keys,
+            orders_count=1,
+            total_minutes=minutes,
+            total_minutes_squared=minutes * minutes,
+            min_minutes=minutes,
+            max_minutes=minutes,
+            **{column: int(column == bucket) for column in PREPARATION_BUCKET_COLUMNS},
+        )
+        return statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                "orders_count": table.c.orders_count + 1,
+                "total_minutes": table.c.total_minutes + minutes,
+                "total_minutes_squared": table.c.total_minutes_squared + minutes * minutes,
+                "min_minutes": smallest(table.c.min_minutes, minutes),
+                "max_minutes": largest(table.c.max_minutes, minutes),
+                bucket: table.c[bucket] + 1,
+            },
+        )
@@ -1,9 +1,25 @@
-from datetime import datetime, timezone, time
+from datetime import datetime, timezone, time, timedelta
+from decimal import Decimal
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, update, func, tuple_, or_, Row, Select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db.models.schemas import OrderItem, Order, OrderStatus
+from app.db.models.schemas import (
+    OrderItem,
+    Order,
+    OrderStatus,
+    Payment,
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedPayment,
+)
 from app.schemas.order_schemas import OrderSchema, OrderItemSchema
+from app.lib.pagination import Keyset
+from app.core.order_transitions import OrderTransition, TransitionGuards
+from app.db.events_listeners.order_listeners import PRICE_QUANTUM, PRICE_SCALE, mark_orders_changed
 
 class OrderRepository:
 
@@ -18,18 +34,36 @@ class OrderRepository:
 
         return new_order
 
-    async def get_order_by_id(self, order_id: int) -> Order:
-        order = await self.session.get(Order, order_id)
+    async def get_order_by_id(self, order_id: int, with_items: bool = False) -> Order:
+        options = [selectinload(Order.items)] if with_items else None
+        order = await self.session.get(Order, order_id, options=options)
         return order
 
     async def get_order_item_by_id(self, order_item_id: int) -> OrderItem:
         order_item = await self.session.get(OrderItem, order_item_id)
         return order_item
 
-    async def cancel_order(self, order: Order):
+    async def get_order_and_item(
+        self,
+        order_id: int,
+        order_item_id: int,
+        with_items: bool = False,
+    ) -> Tuple[Optional[Order], Optional[OrderItem]]:
 
-        order.status = OrderStatus.CANCELED
-        await self.session.flush()
+        # One round-trip: the item is LEFT JOINed on its own id, not on the order,
+        # so a missing item and an item of another order can still be told apart
+        query = (
+            select(Order, OrderItem)
+            .outerjoin(OrderItem, OrderItem.id == order_item_id)
+            .where(Order.id == order_id)
+        )
+        if with_items:
+            query = query.options(selectinload(Order.items))
+
+        row = (await self.session.execute(query)).first()
+        if row is None:
+            return None, None
+        return row.Order, row.OrderItem
 
     async def add_item_to_order(self, order: Order, order_item_data: OrderItemSchema) -> OrderItem:
 
@@ -51,36 +85,310 @@ class OrderRepository:
         await self.session.delete(order_item)
         await self.session.flush()
 
-    async def update_order_status(self, order: Order, status: OrderStatus):
+    async def bulk_update_order_items(
+        self,
+        order: Order,
+        new_items: List[OrderItemSchema],
+        removed_item_ids: List[int],
+    ) -> Tuple[List[int], List[int]]:
 
-        if status == OrderStatus.PREPARING:
-            order.confirmed_on = datetime.now(tz=timezone.utc)
-        elif status == OrderStatus.COMPLETED:
-            order.order_ready_in = datetime.now(tz=timezone.utc)
+        # Bulk statements skip the per-item mapper listeners, so the price is moved here once
+        delta = Decimal(0)
+        removed_ids: List[int] = []
 
-        order.status = status
-        await self.session.flush()
+        if removed_item_ids:
+            result = await self.session.execute(
+                delete(OrderItem)
+                .where(OrderItem.id.in_(removed_item_ids), OrderItem.order == order.id)
+                .returning(OrderItem.id, OrderItem.quantity, OrderItem.unit_price)
+                .execution_options(synchronize_session=False)
+            )
+            for item_id, quantity, unit_price in result:
+                removed_ids.append(item_id)
+                delta -= unit_price * quantity
+
+        added_ids: List[int] = []
+        if new_items:
+            result = await self.session.scalars(
+                insert(OrderItem).returning(OrderItem.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "quantity": item.quantity,
+                        "flavor": item.flavor,
+                        "size": item.size,
+                        "unit_price": item.unit_price,
+                        "order": order.id,
+                    }
+                    for item in new_items
+                ],
+            )
+            # Returned in the order of new_items, whatever order the database assigns ids in
+            added_ids = list(result)
+            delta += sum(Decimal(str(item.unit_price)) * item.quantity for item in new_items)
+
+        # Rounded to the column's scale, like the listeners' deltas, so SQLite's float column does not drift
+        delta = delta.quantize(PRICE_QUANTUM)
+        if delta:
+            price = await self.session.scalar(
+                update(Order)
+                .where(Order.id == order.id)
+                .values(price=func.round(Order.price + delta, PRICE_SCALE))
+                .returning(Order.price)
+                .execution_options(synchronize_session=False)
+            )
+            set_committed_value(order, "price", price)
+        mark_orders_changed(self.session.sync_session, [order.id])
+
+        return added_ids, removed_ids
+
+    async def transition_order_status(
+        self,
+        order_id: int,
+        status: OrderStatus,
+        transition: OrderTransition,
+        guards: TransitionGuards = TransitionGuards(),
+        with_items: bool = False,
+    ) -> Optional[Order]:
+
+        # The guards live in the WHERE clause, so of two racing requests only one matches;
+        # None means some guard failed and `get_order_state` tells which
+        values = {"status": status, "version": Order.version + 1}
+        if transition.timestamp:
+            values[transition.timestamp] = datetime.now(tz=timezone.utc)
+
+        query = (
+            update(Order)
+            .where(Order.id == order_id, Order.status.in_(transition.sources))
+            .values(**values)
+            .returning(Order)
+            .execution_options(populate_existing=True)
+        )
+        if guards.owner_id is not None:
+            query = query.where(Order.user == guards.owner_id)
+        if guards.confirmed_since is not None:
+            query = query.where(or_(Order.confirmed_on.is_(None), Order.confirmed_on >= guards.confirmed_since))
+        if guards.expected_version is not None:
+            query = query.where(Order.version == guards.expected_version)
+        if with_items:
+            query = query.options(selectinload(Order.items))
+
+        order = (await self.session.scalars(query)).first()
+        if order is not None:
+            mark_orders_changed(self.session.sync_session, [order.id])
 
         return order
 
+    async def get_order_state(self, order_id: int) -> Optional[Row]:
+        result = await self.session.execute(
+            select(Order.id, Order.user, Order.status, Order.confirmed_on, Order.version)
+            .where(Order.id == order_id)
+        )
+        return result.first()
+
     async def implement_estimated_time(self, order_id: int, estimated_time: datetime):
         order = await self.get_order_by_id(order_id)
         order.estimated_time = estimated_time
-        await self.session.flush
+        await self.session.flush()
+
+    @staticmethod
+    def _today_range() -> Tuple[datetime, datetime]:
+        start = datetime.combine(datetime.now(tz=timezone.utc), time.min)
+        return start, start + timedelta(days=1)
 
-    async def list_orders_by_status(self, order_status: OrderStatus):
+    def _listing_query(
+        self,
+        query: Select,
+        order_status: OrderStatus,
+        after: Optional[Keyset] = None,
+        limit: Optional[int] = None,
+    ) -> Select:
 
-        today = datetime.now(tz=timezone.utc)
+        # Equality on status, then the day range and keyset walked along ix_orders_status_created_at
+        start, end = self._today_range()
 
         query = (
-            select(Order)
+            query
             .where(
                 Order.status == order_status,
-                Order.created_at >= datetime.combine(today, time.min),
-                Order.created_at <= datetime.combine(today, time.max)
+                Order.created_at >= start,
+                Order.created_at < end
             )
+            .order_by(Order.created_at, Order.id)
+        )
+        if after is not None:
+            query = query.where(tuple_(Order.created_at, Order.id) > tuple_(*after))
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query
+
+    async def stream_orders_by_status(
+        self,
+        order_status: OrderStatus,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Order]:
+
+        # Rows are fetched `batch_size` at a time (items with one selectin per batch)
+        # and expunged once handed out, so memory stays flat however many orders match
+        query = (
+            self._listing_query(select(Order).options(selectinload(Order.items)), order_status)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream_scalars(query)
+
+        async for partition in result.partitions():
+            for order in partition:
+                yield order
+                self.session.expunge(order)
+
+    async def stream_orders_for_export(
+        self,
+        start: datetime,
+        end: datetime,
+        archived: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+
+        # Orders come off a server-side cursor `batch_size` rows at a time; each partition
+        # gets its items and payments with one IN query apiece and is handed out as plain
+        # dicts, so nothing outlives the partition and no ORM objects are built
+        order_model, item_model, payment_model = (
+            (ArchivedOrder, ArchivedOrderItem, ArchivedPayment) if archived else (Order, OrderItem, Payment)
+        )
+        query = (
+            select(order_model.__table__)
+            .where(order_model.created_at >= start, order_model.created_at < end)
+            .order_by(order_model.created_at, order_model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+
+        async for partition in result.mappings().partitions():
+            orders = {row["id"]: {**row, "archived": archived, "items": [], "payments": []} for row in partition}
+            await self._attach_export_children(orders, item_model, payment_model)
+            yield list(orders.values())
+
+    async def _attach_export_children(self, orders: Dict[int, Dict[str, Any]], item_model, payment_model) -> None:
+        items = await self.session.execute(
+            select(item_model.__table__).where(item_model.order.in_(orders)).order_by(item_model.id)
+        )
+        for item in items.mappings():
+            orders[item["order"]]["items"].append(dict(item))
+
+        payments = await self.session.execute(
+            select(payment_model.__table__).where(payment_model.related_order.in_(orders))
+        )
+        for payment in payments.mappings():
+            orders[payment["related_order"]]["payments"].append(dict(payment))
+
+    async def list_order_summaries_by_status(
+        self,
+        order_status: OrderStatus,
+        after: Optional[Keyset] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[Row]:
+
+        # Only columns held by ix_orders_status_created_at: an index-only scan on PostgreSQL,
+        # where the index INCLUDEs them; SQLite indexes (status, created_at) alone and
+        # still reads each matching row from the table
+        query = self._listing_query(
+            select(
+                Order.id,
+                Order.status,
+                Order.user,
+                Order.price,
+                Order.created_at,
+                Order.confirmed_on,
+                Order.order_ready_in,
+            ),
+            order_status,
+            after,
+            limit,
         )
         result = await self.session.execute(query)
-        orders = result.scalars().all()
 
-        return orders
+        return result.all()
+
+    # Projections: OrderSchema built straight from column rows, no ORM objects hydrated.
+    # Two statements whatever the number of orders: the orders, then all their items.
+
+    # The archive tables share the column names, so the same projection reads them too
+
+    @staticmethod
+    def _order_columns(model=Order) -> tuple:
+        return (
+            model.id,
+            model.status,
+            model.user,
+            model.price,
+            model.created_at,
+            model.confirmed_on,
+            model.version,
+        )
+
+    @staticmethod
+    def _item_columns(model=OrderItem) -> tuple:
+        return (
+            model.order,
+            model.quantity,
+            model.flavor,
+            model.size,
+            model.unit_price,
+        )
+
+    async def _project_orders(self, order_rows: Sequence[Row], item_model=OrderItem) -> List[OrderSchema]:
+        if not order_rows:
+            return []
+
+        result = await self.session.execute(
+            select(*self._item_columns(item_model))
+            .where(item_model.order.in_([row.id for row in order_rows]))
+            .order_by(item_model.id)
+        )
+        items: Dict[int, List[OrderItemSchema]] = defaultdict(list)
+        for item in result:
+            items[item.order].append(OrderItemSchema(
+                quantity=item.quantity,
+                flavor=item.flavor,
+                size=item.size,
+                unit_price=item.unit_price,
+                order=item.order,
+            ))
+
+        return [
+            OrderSchema(
+                id=row.id,
+                status=row.status.value,
+                user=row.user,
+                price=row.price,
+                created_at=row.created_at,
+                confirmed_on=row.confirmed_on,
+                version=row.version,
+                items=items[row.id],
+            )
+            for row in order_rows
+        ]
+
+    async def get_order_projection(self, order_id: int, include_archive: bool = False) -> Optional[OrderSchema]:
+        result = await self.session.execute(select(*self._order_columns()).where(Order.id == order_id))
+        orders = await self._project_orders(result.all())
+        if orders or not include_archive:
+            return orders[0] if orders else None
+
+        # Closed orders moved out by the archival task keep their ids
+        result = await self.session.execute(
+            select(*self._order_columns(ArchivedOrder)).where(ArchivedOrder.id == order_id)
+        )
+        orders = await self._project_orders(result.all(), item_model=ArchivedOrderItem)
+        return orders[0] if orders else None
+
+    async def list_order_projections_by_status(
+        self,
+        order_status: OrderStatus,
+        after: Optional[Keyset] = None,
+        limit: Optional[int] = None,
+    ) -> List[OrderSchema]:
+
+        query = self._listing_query(select(*self._order_columns()), order_status, after, limit)
+        result = await self.session.execute(query)
+        return await self._project_orders(result.all())
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from typing import List, Sequence
+
+from kombu.utils.json import dumps
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.schemas import OutboxMessage
+from app.events.order_events import BaseOrderEvent
+
+
+class OutboxRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(self, event: BaseOrderEvent) -> OutboxMessage:
+        # Flushed and committed with the rest of the request's transaction, or not at all
+        message = OutboxMessage(
+            event_id=event.id,
+            event_type=type(event).__name__,
+            # kombu's JSON keeps datetimes and Decimals, as Celery's serializer does
+            payload=dumps(event.to_payload()),
+        )
+        self.session.add(message)
+        return message
+
+    async def claim_pending(self, limit: int, max_attempts: int) -> List[OutboxMessage]:
+        result = await self.session.execute(
+            select(OutboxMessage)
+            .where(OutboxMessage.published_at.is_(None), OutboxMessage.attempts < max_attempts)
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            # Concurrent relays take disjoint batches on PostgreSQL; ignored by SQLite
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars())
+
+    async def mark_published(self, message_ids: Sequence[int]) -> None:
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(message_ids))
+            .values(published_at=datetime.now(timezone.utc), attempts=OutboxMessage.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed(self, message_ids: Sequence[int], error: str) -> None:
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(message_ids))
+            .values(attempts=OutboxMessage.attempts + 1, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def delete_published_before(self, cutoff: datetime) -> int:
+        result = await self.session.execute(
+            delete(OutboxMessage)
+            .where(OutboxMessage.published_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
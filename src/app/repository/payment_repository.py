@@ -1,10 +1,11 @@
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.schemas import (
     Payment,
     PaymentStatus,
-    Order,
 )
+from app.schemas.order_schemas import OrderSchema
 
 class PaymentRepository:
 
@@ -14,13 +15,13 @@ class PaymentRepository:
     async def create_payment(
         self,
         checkout_session_id: str,
-        order: Order,
+        order: OrderSchema,
     ) -> None:
 
         new_payment = Payment(
             id=checkout_session_id,
             related_order=order.id,
-            amount_paid=order.price,
+            amount_paid=Decimal(str(order.price)),
         )
         self.session.add(new_payment)
         await self.session.flush()
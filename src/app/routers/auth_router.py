@@ -1,13 +1,24 @@
 from typing import Dict, Any, Annotated
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.schemas.auth_schemas import SigninSchema, SignupSchema
 from app.services.account.signin import SigninService
 from app.services.account.signup import SignupService
-from app.lib.token_jwt import verify_token, signin_access_token
+from app.repository.account_repository import AccountRepository
+from app.core.principal import Principal
+from app.core.security import oauth2_schema
+from app.core.exceptions import AccessDeniedError
+from app.lib.rate_limiter import login_rate_limiter
+from app.lib.token_jwt import (
+    verify_token,
+    get_current_principal,
+    signin_access_token,
+    revoke_access_token,
+)
 
 from app.dependencies.account_dependencies import (
+    get_read_account_repository,
     get_signin_service,
     get_signup_service,
 )
@@ -17,26 +28,53 @@ auth_router = APIRouter(prefix="/auth", tags=["auth"])
 @auth_router.post("/signin", status_code=status.HTTP_200_OK)
 async def signin(
     data: Annotated[SigninSchema, OAuth2PasswordRequestForm],
+    request: Request,
     signin_service: SigninService = Depends(get_signin_service),
 ) -> Dict[str, Any]:
 
+    await login_rate_limiter.check(
+        ip=request.client.host if request.client else None,
+        email=data.email,
+    )
     return await signin_service.auth_service(data=data)
 
 @auth_router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup(
     data: SignupSchema,
+    request: Request,
     signup_service: SignupService = Depends(get_signup_service),
 ) -> Dict[str, Any]:
 
+    await login_rate_limiter.check(
+        ip=request.client.host if request.client else None,
+        email=data.email,
+    )
     return await signup_service.account_creation_service(data=data)
 
 @auth_router.post("/refresh")
-async def use_refresh_token(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
+async def use_refresh_token(
+    principal: Principal = Depends(get_current_principal),
+    account_repository: AccountRepository = Depends(get_read_account_repository),
+) -> Dict[str, Any]:
+
+    # Refresh tokens are long lived: read the user again so new claims are current
+    user = await account_repository.get_account_by_id(principal.id)
+    if not user or not user.active:
+        raise AccessDeniedError()
 
-    new_access_token = await signin_access_token(user_id=user_id)
+    new_access_token = await signin_access_token(principal=Principal.from_user(user))
 
     return {
         "acces_token": new_access_token,
         "token_type": "Bearer",
-        "user": user_id
+        "user": str(principal.id)
     }
+
+@auth_router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout(
+    token: str = Depends(oauth2_schema),
+    _: str = Depends(verify_token),
+) -> Dict[str, Any]:
+
+    revoke_access_token(token)
+    return {"message": "Logged out successfully."}
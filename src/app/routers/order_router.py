@@ -1,28 +1,35 @@
 from typing import (
     Dict,
     Any,
-    List,
+    Union,
+    Optional,
+    AsyncIterator,
 )
 from fastapi import (
     APIRouter,
     Depends,
-    Request,
     status,
 )
+from fastapi.responses import StreamingResponse
 
-from app.dependencies.order_dependencies import get_order_service
-from app.db.models.schemas import OrderStatus
+from app.dependencies.order_dependencies import OrderListingParams, get_order_service, get_read_order_service
+from app.db.models.schemas import Order, OrderStatus
 from app.services.orders.order import OrderService
+from app.core.principal import Principal
 from app.lib.token_jwt import (
     verify_token,
-    require_admin
+    get_current_principal,
+    require_admin,
 )
 from app.schemas.order_schemas import (
     OrderSchema,
     CreateOrderSchema,
     OrderItemSchema,
+    BulkOrderItemsSchema,
     DeleteItemFromOrderSchema,
+    OrderExportParams,
 )
+from app.services.orders.order_export import ORDER_EXPORT_MEDIA_TYPES
 
 
 order_router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depends(verify_token)])
@@ -41,7 +48,7 @@ async def create_order(
 @order_router.get("/get-order/{order_id}", status_code=status.HTTP_200_OK)
 async def get_order(
     order_id: int,
-    order_service: OrderService = Depends(get_order_service),
+    order_service: OrderService = Depends(get_read_order_service),
 ) -> Dict[str, OrderSchema]:
 
     order = await order_service.get_order(order_id=order_id)
@@ -51,13 +58,15 @@ async def get_order(
 @order_router.post("/cancel-order/{order_id}", status_code=status.HTTP_200_OK)
 async def cancel_order(
     order_id: int,
-    request: Request,
+    version: Optional[int] = None,
     order_service: OrderService = Depends(get_order_service),
+    principal: Principal = Depends(get_current_principal),
 ):
 
     order = await order_service.cancel_order(
         order_id=order_id,
-        user_id=int(request.state.user["id"]),
+        principal=principal,
+        expected_version=version,
     )
     return {
         "content": f"Order canceled successfully. OrderId: {order_id}",
@@ -65,50 +74,112 @@ async def cancel_order(
     }
 
 
-@order_router.post("/list-orders")
+@order_router.post("/list-orders", response_model=None)
 async def list_orders(
     order_status: OrderStatus,
-    request: Request,
-    order_service: OrderService = Depends(get_order_service),
-    _: None = Depends(require_admin)
-) -> Dict[str, List[OrderSchema]]:
+    listing: OrderListingParams = Depends(),
+    order_service: OrderService = Depends(get_read_order_service),
+    _: Principal = Depends(require_admin),
+) -> Union[Dict[str, Any], StreamingResponse]:
+
+    if listing.stream:
+        # Every matching order as one JSON document per line, read in batches
+        return StreamingResponse(
+            _orders_as_ndjson(order_service.stream_orders(order_status)),
+            media_type="application/x-ndjson",
+        )
+
+    if listing.summary:
+        # Served from the (status, created_at) index without the items
+        orders, next_cursor = await order_service.list_order_summaries(
+            order_status=order_status,
+            limit=listing.limit,
+            cursor=listing.cursor,
+        )
+    else:
+        # Already OrderSchema projections, so they are returned as they are
+        orders, next_cursor = await order_service.list_orders_page(
+            order_status=order_status,
+            limit=listing.limit,
+            cursor=listing.cursor,
+        )
+
+    return {"orders": orders, "next_cursor": next_cursor}
+
+
+async def _orders_as_ndjson(orders: AsyncIterator[Order]) -> AsyncIterator[str]:
+    async for order in orders:
+        yield OrderSchema.model_validate(order).model_dump_json() + "\n"
+
+
+@order_router.get("/export", response_model=None)
+async def export_orders(
+    export: OrderExportParams = Depends(),
+    order_service: OrderService = Depends(get_read_order_service),
+    _: Principal = Depends(require_admin),
+) -> StreamingResponse:
 
-    orders = await order_service.list_orders(
-        user_id=int(request.state.user["id"]),
-        order_status=order_status,
-    )
+    """Only the admin can call this route"""
 
-    return {"orders": orders}
+    filename = f"orders_{export.start:%Y%m%d%H%M%S}_{export.end:%Y%m%d%H%M%S}.{export.export_format.value}"
+    if export.gzip:
+        filename += ".gz"
+
+    return StreamingResponse(
+        order_service.export_orders(export),
+        media_type="application/gzip" if export.gzip else ORDER_EXPORT_MEDIA_TYPES[export.export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @order_router.post("/add-item/{order_id}", status_code=status.HTTP_201_CREATED)
 async def add_item_to_order(
     order_id: int,
     order_item_data: OrderItemSchema,
-    request: Request,
     order_service: OrderService = Depends(get_order_service),
+    principal: Principal = Depends(get_current_principal),
 ) -> Dict[str, int]:
 
     order_item = await order_service.add_item_to_order(
         order_id=order_id,
-        user_id=int(request.state.user["id"]),
+        principal=principal,
         order_item_data=order_item_data,
     )
     return {"order_item": order_item.id}
 
 
+@order_router.post("/items/{order_id}", status_code=status.HTTP_200_OK)
+async def bulk_update_order_items(
+    order_id: int,
+    items_data: BulkOrderItemsSchema,
+    order_service: OrderService = Depends(get_order_service),
+    principal: Principal = Depends(get_current_principal),
+) -> Dict[str, Any]:
+
+    order, added_ids = await order_service.bulk_update_order_items(
+        order_id=order_id,
+        principal=principal,
+        items_data=items_data,
+    )
+    return {
+        "order_items": added_ids,
+        "removed": items_data.remove,
+        "price": float(order.price),
+    }
+
+
 @order_router.delete("/delete-order-item/{order_item_id}", status_code=status.HTTP_200_OK)
 async def delete_item_from_order(
     order_item_id: int,
     order: DeleteItemFromOrderSchema,
-    request: Request,
     order_service: OrderService = Depends(get_order_service),
+    principal: Principal = Depends(get_current_principal),
 ) -> Dict[str, str]:
 
     await order_service.delete_item_from_order(
         order_id=order.id,
         order_item_id=order_item_id,
-        user_id=int(request.state.user["id"]),
+        principal=principal,
     )
 
     return {"message": f"Order item {order_item_id} succesfully deleted."}
@@ -117,29 +188,32 @@ async def delete_item_from_order(
 @order_router.post("/confirm-order/{order_id}", status_code=status.HTTP_200_OK)
 async def confirm_order(
     order_id: int,
-    request: Request,
+    version: Optional[int] = None,
     order_service: OrderService = Depends(get_order_service),
-    _: None = Depends(require_admin),
+    principal: Principal = Depends(require_admin),
 ) -> Dict[str, OrderSchema]:
 
     """Only the admin can call this route"""
 
     order = await order_service.confirm_order(
         order_id=order_id,
-        user_id=int(request.state.user["id"]),
+        principal=principal,
+        expected_version=version,
     )
     return {"order": order}
 
 @order_router.post("/send-order/{order_id}")
 async def send_order(
     order_id: int,
-    request: Request,
+    version: Optional[int] = None,
     order_service: OrderService = Depends(get_order_service),
+    principal: Principal = Depends(get_current_principal),
 ) -> Dict[str, OrderSchema]:
 
     order = await order_service.send_order(
         order_id=order_id,
-        user_id=int(request.state.user["id"])
+        principal=principal,
+        expected_version=version,
     )
 
     return {"order": order}
@@ -147,16 +221,17 @@ async def send_order(
 @order_router.post("/confirm-order-readiness/{order_id}")
 async def confirm_order_readiness(
     order_id: int,
-    request: Request,
+    version: Optional[int] = None,
     order_service: OrderService = Depends(get_order_service),
-    _: None = Depends(require_admin)
+    principal: Principal = Depends(require_admin),
 ) -> Dict[str, OrderSchema]:
 
     """Only the admin can call this route"""
 
     order = await order_service.confirm_order_readiness(
         order_id=order_id,
-        user_id=int(request.state.user["id"]),
+        principal=principal,
+        expected_version=version,
     )
 
     return {"order": order}
@@ -4,15 +4,15 @@ from fastapi import APIRouter, Depends
 from app.lib.token_jwt import verify_token
 from app.utils.get_existing_order import order_exists
 
-from app.db.models.schemas import Order
-from app.dependencies.payment_dependencies import get_payment_service
+from app.schemas.order_schemas import OrderSchema
+from app.dependencies.payment_dependencies import get_payment_service, get_read_payment_service
 from app.services.payments.payment import PaymentService
 
 payment_router = APIRouter(prefix="/payments", tags=["payments"], dependencies=[Depends(verify_token)])
 
 @payment_router.post("/create-checkout-session")
 async def create_checkout_session(
-    order: Order = Depends(order_exists),
+    order: OrderSchema = Depends(order_exists),
     payment_service: PaymentService = Depends(get_payment_service),
 ) -> Dict[str, Any]:
 
@@ -22,7 +22,7 @@ async def create_checkout_session(
 @payment_router.get("/success")
 async def payment_success(
     session_id: str,
-    payment_service: PaymentService = Depends(get_payment_service)
+    payment_service: PaymentService = Depends(get_read_payment_service)
 ) -> Dict[str, Any]:
 
     status = await payment_service.payment_success(session_id=session_id)
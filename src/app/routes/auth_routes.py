@@ -5,7 +5,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from app.schemas.auth_schemas import SigninSchema, SignupSchema
 from app.services.account.SigninService import SigninService
 from app.services.account.SignupService import SignupService
-from app.lib.token_jwt import verify_token, signin_access_token
+from app.core.principal import Principal
+from app.lib.token_jwt import get_current_principal, signin_access_token
 
 from app.dependencies.account_dependencies import (
     get_signin_service,
@@ -31,12 +32,12 @@ async def signup(
     return await signup_service.account_creation_service(data=data)
 
 @auth_router.post("/refresh")
-async def use_refresh_token(user_id: str = Depends(verify_token)) -> Dict[str, Any]:
+async def use_refresh_token(principal: Principal = Depends(get_current_principal)) -> Dict[str, Any]:
     
-    new_access_token = await signin_access_token(user_id=user_id)
+    new_access_token = await signin_access_token(principal=principal)
 
     return {
         "acces_token": new_access_token,
         "token_type": "Bearer",
-        "user": user_id
+        "user": str(principal.id)
     }
\ No newline at end of file
@@ -1,5 +1,8 @@
+from enum import Enum
+from dataclasses import dataclass
 from typing import List, Optional
 from datetime import datetime
+from fastapi import Query
 from pydantic import BaseModel
 from app.db.models.schemas import ItemSize
 
@@ -21,6 +24,10 @@ class OrderItemSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkOrderItemsSchema(BaseModel):
+    add: List[OrderItemSchema] = []
+    remove: List[int] = []
+
 class OrderSchema(BaseModel):
     id: int
     status: str
@@ -28,13 +35,42 @@ class OrderSchema(BaseModel):
     price: float
     created_at: datetime
     confirmed_on: Optional[datetime] = None
+    version: int = 1
     items: List[OrderItemSchema]
 
     class Config:
         from_attributes = True
 
+class OrderSummarySchema(BaseModel):
+    id: int
+    status: str
+    user: int
+    price: float
+    created_at: datetime
+    confirmed_on: Optional[datetime] = None
+    order_ready_in: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class CurrentOrder(BaseModel):
     order_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class OrderExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@dataclass(frozen=True, slots=True)
+class OrderExportParams:
+
+    """Query parameters of the export route, resolved with `Depends()` and passed to the service."""
+
+    start: datetime
+    end: datetime
+    export_format: OrderExportFormat = Query(default=OrderExportFormat.NDJSON, alias="format")
+    gzip: bool = False
+    include_archive: bool = True
@@ -3,12 +3,12 @@ from typing import Dict, Any
 from datetime import timedelta
 from dotenv import load_dotenv
 
-from bcrypt import checkpw
-
+from app.core.principal import Principal
 from app.repository.account_repository import AccountRepository
 from app.schemas.auth_schemas import SigninSchema
 
 from app.lib.token_jwt import signin_access_token
+from app.lib.password_hasher import password_hasher
 from app.core.exceptions import InvalidCredentialsError
 
 load_dotenv()
@@ -27,16 +27,17 @@ class SigninService:
         if not user:
             raise InvalidCredentialsError()
 
-        is_valid_password = checkpw(
-            password=data.password.encode("utf-8"),
+        is_valid_password = await password_hasher.check(
+            password=data.password,
             hashed_password=user.password,
         )
         if not is_valid_password:
             raise InvalidCredentialsError()
 
-        access_token = await signin_access_token(user_id=user.id)
+        principal = Principal.from_user(user)
+        access_token = await signin_access_token(principal=principal)
         refresh_token = await signin_access_token(
-            user_id=user.id,
+            principal=principal,
             token_duration=timedelta(days=int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS")))
         )
 
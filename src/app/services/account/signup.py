@@ -3,12 +3,12 @@ from typing import Dict, Any
 from datetime import timedelta
 from dotenv import load_dotenv
 
-from bcrypt import hashpw, gensalt
-
+from app.core.principal import Principal
 from app.repository.account_repository import AccountRepository
 from app.schemas.auth_schemas import SignupSchema
 
 from app.lib.token_jwt import signin_access_token
+from app.lib.password_hasher import password_hasher
 from app.core.exceptions import EmailAlreadyExistsError
 
 load_dotenv()
@@ -26,15 +26,16 @@ class SignupService:
         if user:
             raise EmailAlreadyExistsError()
 
-        hashed_password = hashpw(
-            password=data.password.encode("utf-8"),
-            salt=gensalt(8)
+        hashed_password = await password_hasher.hash(
+            password=data.password,
+            rounds=8,
         )
         new_user = await self.account_repository.create_account(data, hashed_password)
 
-        access_token = await signin_access_token(user_id=new_user.id)
+        principal = Principal.from_user(new_user)
+        access_token = await signin_access_token(principal=principal)
         refresh_token = await signin_access_token(
-            user_id=new_user.id,
+            principal=principal,
             token_duration=timedelta(days=int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS")))
         )
 
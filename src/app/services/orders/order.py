@@ -1,7 +1,8 @@
 from datetime import (
-    datetime, timedelta, timezone
+    datetime, timezone
 )
 from typing import (
+    AsyncIterator,
     Optional,
     List,
     Tuple,
@@ -10,18 +11,25 @@ from typing import (
 from app.db.models.schemas import (
     Order,
     OrderStatus,
-    User,
     OrderItem,
 )
 from app.schemas.order_schemas import (
     OrderSchema,
     OrderItemSchema,
+    OrderSummarySchema,
+    BulkOrderItemsSchema,
+    OrderExportParams,
 )
 
 
+from app.core.principal import Principal
+from app.core.order_transitions import ORDER_TRANSITIONS, CANCELLATION_WINDOW, TransitionGuards
+from app.lib.pagination import encode_cursor, decode_cursor
+from app.lib.order_cache import order_cache
+from app.services.orders.order_export import encode_order_export
 from app.repository.order_repository import OrderRepository
-from app.repository.account_repository import AccountRepository
-from app.events.dispatcher import EventDispatcher
+from app.repository.kitchen_stats_repository import KitchenStatsRepository
+from app.repository.outbox_repository import OutboxRepository
 
 from app.core.exceptions import (
     OrderCancellationTimeExceededError,
@@ -30,7 +38,9 @@ from app.core.exceptions import (
     OrderItemDoesNotBelongToOrderError,
     OrderNotFoundError,
     OrderItemNotFoundError,
-    UserNotFoundError,
+    InvalidOrderTransitionError,
+    OrderVersionConflictError,
+    InvalidExportRangeError,
 )
 from app.events.order_events import (
     OrderConfirmedEvent,
@@ -44,76 +54,167 @@ class OrderService:
 
     def __init__(
         self,
-        account_repository: AccountRepository,
         order_repository: OrderRepository,
-        event_dispatcher: EventDispatcher,
+        outbox_repository: Optional[OutboxRepository] = None,
+        kitchen_stats_repository: Optional[KitchenStatsRepository] = None,
     ):
-        self.account_repository = account_repository
         self.order_repository = order_repository
-        self.event_dispatcher = event_dispatcher
+        self.outbox_repository = outbox_repository
+        self.kitchen_stats_repository = kitchen_stats_repository
 
     async def create_order(self, order_data: OrderSchema):
         order = await self.order_repository.create_order(order_data)
         return order
 
+    async def get_order(self, order_id: int) -> OrderSchema:
+        order = await order_cache.get_or_load(
+            order_id,
+            lambda: self.order_repository.get_order_projection(order_id, include_archive=True),
+        )
+        if not order:
+            raise OrderNotFoundError()
+        return order
+
     async def cancel_order(
         self,
         order_id: int,
-        user_id: int,
+        principal: Principal,
+        expected_version: Optional[int] = None,
     ) -> Order:
-        order, user, _ = await self._ensure_entities_exists(
+
+        return await self._transition(
             order_id=order_id,
-            user_id=user_id,
+            status=OrderStatus.CANCELED,
+            principal=principal,
+            expected_version=expected_version,
         )
-        if datetime.now(timezone.utc) - order.confirmed_on > timedelta(minutes=15) and not user.admin:
-            raise OrderCancellationTimeExceededError()
 
-        if order.user != user_id and not user.admin:
-            raise OrderDoesNotBelongToUserError()
+    async def list_orders_page(
+        self,
+        order_status: OrderStatus,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[OrderSchema], Optional[str]]:
+
+        # One extra row tells whether there is a next page
+        orders = await self.order_repository.list_order_projections_by_status(
+            order_status,
+            after=decode_cursor(cursor),
+            limit=limit + 1,
+        )
+        return self._page(list(orders), limit)
 
-        await self.order_repository.cancel_order(order)
+    def stream_orders(self, order_status: OrderStatus) -> AsyncIterator[Order]:
+        return self.order_repository.stream_orders_by_status(order_status)
 
-        return order
+    def export_orders(self, export: OrderExportParams) -> AsyncIterator[bytes]:
+
+        # created_at is stored as naive UTC
+        start, end = (
+            moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+            for moment in (export.start, export.end)
+        )
+        if end <= start:
+            raise InvalidExportRangeError()
+
+        return encode_order_export(
+            self._export_partitions(start, end, export.include_archive),
+            export_format=export.export_format,
+            compress=export.gzip,
+        )
+
+    async def _export_partitions(self, start: datetime, end: datetime, include_archive: bool):
+        # Hot orders first, then the archived ones of the same range
+        for archived in (False, True) if include_archive else (False,):
+            async for orders in self.order_repository.stream_orders_for_export(start, end, archived=archived):
+                yield orders
 
-    async def list_orders(
+    async def list_order_summaries(
         self,
         order_status: OrderStatus,
-    ) -> List[Order]:
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[OrderSummarySchema], Optional[str]]:
+
+        rows = await self.order_repository.list_order_summaries_by_status(
+            order_status,
+            after=decode_cursor(cursor),
+            limit=limit + 1,
+        )
+        rows, next_cursor = self._page(list(rows), limit)
+        summaries = [
+            OrderSummarySchema(
+                id=row.id,
+                status=row.status.value,
+                user=row.user,
+                price=row.price,
+                created_at=row.created_at,
+                confirmed_on=row.confirmed_on,
+                order_ready_in=row.order_ready_in,
+            )
+            for row in rows
+        ]
+        return summaries, next_cursor
 
-        orders = await self.order_repository.list_orders_by_status(order_status)
-        return orders
+    @staticmethod
+    def _page(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
 
     async def add_item_to_order(
         self,
         order_id: int,
-        user_id: int,
+        principal: Principal,
         order_item_data: OrderItemSchema
     ) -> OrderItem:
 
-        order, user, _ = await self._ensure_entities_exists(
-            order_id=order_id,
-            user_id=user_id,
-        )
+        order, _ = await self._ensure_entities_exists(order_id=order_id)
 
-        if order.user != user.id:
+        if order.user != principal.id:
             raise PermissionDeniedError()
 
         order_item = await self.order_repository.add_item_to_order(order, order_item_data)
         return order_item
 
+    async def bulk_update_order_items(
+        self,
+        order_id: int,
+        principal: Principal,
+        items_data: BulkOrderItemsSchema,
+    ) -> Tuple[Order, List[int]]:
+
+        order, _ = await self._ensure_entities_exists(order_id=order_id)
+
+        if order.user != principal.id:
+            raise PermissionDeniedError()
+
+        remove_ids = list(dict.fromkeys(items_data.remove))
+        added_ids, removed_ids = await self.order_repository.bulk_update_order_items(
+            order=order,
+            new_items=items_data.add,
+            removed_item_ids=remove_ids,
+        )
+        # Every id has to be one of this order's items; otherwise nothing is applied
+        if len(removed_ids) != len(remove_ids):
+            raise OrderItemDoesNotBelongToOrderError()
+
+        return order, added_ids
+
     async def delete_item_from_order(
         self,
         order_id: int,
         order_item_id: int,
-        user_id: int,
+        principal: Principal,
     ) -> None:
 
-        order, user, order_item = await self._ensure_entities_exists(
+        order, order_item = await self._ensure_entities_exists(
             order_id=order_id,
-            user_id=user_id,
             order_item_id=order_item_id,
         )
-        if order.user != user.id and not user.admin:
+        if order.user != principal.id and not principal.admin:
             raise PermissionDeniedError()
 
         if order_item.order != order.id:
@@ -124,23 +225,24 @@ class OrderService:
     async def confirm_order(
         self,
         order_id: int,
-        user_id: int,
+        principal: Principal,
+        expected_version: Optional[int] = None,
     ) -> Order:
-        order, user, _ = await self._ensure_entities_exists(
-            order_id=order_id,
-            user_id=user_id
-        )
-        if not user.admin:
+        if not principal.admin:
             raise PermissionDeniedError()
 
-        order = await self.order_repository.update_order_status(
-            order=order,
+        order = await self._transition(
+            order_id=order_id,
             status=OrderStatus.PREPARING,
+            principal=principal,
+            expected_version=expected_version,
+            with_items=True,
         )
-        await self.event_dispatcher.dispatch(
+        # Published by the outbox relay once this transaction commits
+        self.outbox_repository.add(
             OrderConfirmedEvent(
-                user_email=user.email,
-                user_name=user.name,
+                user_email=principal.email,
+                user_name=principal.name,
                 order_id=order.id,
                 order=order.to_dict,
             )
@@ -151,25 +253,30 @@ class OrderService:
     async def confirm_order_readiness(
         self,
         order_id: int,
-        user_id: int,
+        principal: Principal,
+        expected_version: Optional[int] = None,
     ) -> Order:
 
-        order, user, _ = await self._ensure_entities_exists(
-            order_id=order_id,
-            user_id=user_id
-        )
-
-        if not user.admin:
+        if not principal.admin:
             raise PermissionDeniedError()
 
-        order = await self.order_repository.update_order_status(
-            order=order,
-            status=OrderStatus.COMPLETED
+        order = await self._transition(
+            order_id=order_id,
+            status=OrderStatus.COMPLETED,
+            principal=principal,
+            expected_version=expected_version,
+            with_items=True,
         )
-        await self.event_dispatcher.dispatch(
+        if self.kitchen_stats_repository is not None and order.confirmed_on is not None:
+            # Same transaction as the transition, so the aggregates never count an order twice
+            await self.kitchen_stats_repository.record_preparation(
+                ready_at=order.order_ready_in,
+                minutes=(order.order_ready_in - order.confirmed_on).total_seconds() / 60,
+            )
+        self.outbox_repository.add(
             OrderReadyEvent(
-                user_email=user.email,
-                user_name=user.name,
+                user_email=principal.email,
+                user_name=principal.name,
                 order_id=order.id,
             )
         )
@@ -178,38 +285,95 @@ class OrderService:
     async def send_order(
         self,
         order_id: int,
-        user_id: int,
+        principal: Principal,
+        expected_version: Optional[int] = None,
     ) -> Order:
-        order, user, _ = await self._ensure_entities_exists(
+
+        return await self._transition(
             order_id=order_id,
-            user_id=user_id
+            status=OrderStatus.AWAITING_CONFIRMATION,
+            principal=principal,
+            expected_version=expected_version,
+            with_items=True,
         )
-        if order.user != user.id and not user.admin:
-            raise PermissionDeniedError()
 
-        order = await self.order_repository.update_order_status(
-            order=order,
-            status=OrderStatus.AWAITING_CONFIRMATION,
+    async def _transition(
+        self,
+        order_id: int,
+        status: OrderStatus,
+        principal: Principal,
+        *,
+        expected_version: Optional[int] = None,
+        with_items: bool = False,
+    ) -> Order:
+
+        # Admins act on any order (and the admin-only transitions check that before
+        # getting here); customers only on their own
+        transition = ORDER_TRANSITIONS[status]
+        guards = TransitionGuards(
+            owner_id=None if principal.admin else principal.id,
+            confirmed_since=(
+                datetime.now(timezone.utc) - CANCELLATION_WINDOW
+                if status == OrderStatus.CANCELED and not principal.admin else None
+            ),
+            expected_version=expected_version,
         )
-        return order
+
+        order = await self.order_repository.transition_order_status(
+            order_id=order_id,
+            status=status,
+            transition=transition,
+            guards=guards,
+            with_items=with_items,
+        )
+        if order is not None:
+            return order
+
+        # Only a refused transition pays for this lookup, to report which guard failed
+        state = await self.order_repository.get_order_state(order_id)
+        if state is None:
+            raise OrderNotFoundError()
+
+        if guards.owner_id is not None and state.user != guards.owner_id:
+            if status == OrderStatus.CANCELED:
+                raise OrderDoesNotBelongToUserError()
+            raise PermissionDeniedError()
+
+        if expected_version is not None and state.version != expected_version:
+            raise OrderVersionConflictError()
+
+        if state.status not in transition.sources:
+            raise InvalidOrderTransitionError(
+                f"An order that is {state.status.value} cannot become {status.value}."
+            )
+
+        if guards.confirmed_since is not None and state.confirmed_on is not None:
+            raise OrderCancellationTimeExceededError()
+
+        # The row changed between the refused UPDATE and this lookup
+        raise OrderVersionConflictError()
 
     async def _ensure_entities_exists(
         self,
         order_id: Optional[int] = None,
-        user_id: Optional[int] = None,
         order_item_id: Optional[int] = None,
-    ) -> Tuple[Optional[Order], Optional[User], Optional[OrderItem]]:
+        with_items: bool = False,
+    ) -> Tuple[Optional[Order], Optional[OrderItem]]:
+
+        if order_id and order_item_id:
+            order, order_item = await self.order_repository.get_order_and_item(
+                order_id,
+                order_item_id,
+                with_items=with_items,
+            )
+        else:
+            order = await self.order_repository.get_order_by_id(order_id, with_items=with_items) if order_id else None
+            order_item = await self.order_repository.get_order_item_by_id(order_item_id) if order_item_id else None
 
-        order = await self.order_repository.get_order_by_id(order_id) if order_id else None
         if order_id and not order:
             raise OrderNotFoundError()
 
-        user = await self.account_repository.get_account_by_id(user_id) if user_id else None
-        if user_id and not user:
-            raise UserNotFoundError()
-
-        order_item = await self.order_repository.get_order_item_by_id(order_item_id) if order_item_id else None
         if order_item_id and not order_item:
             raise OrderItemNotFoundError()
 
-        return order, user, order_item
+        return order, order_item
@@ -0,0 +1,117 @@
+import io
+import csv
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Iterable, List
+
+from app.schemas.order_schemas import OrderExportFormat
+
+# One CSV row per order item (orders without items get a single row with the
+# item columns empty); payments are summed per order. NDJSON keeps everything.
+ORDER_EXPORT_CSV_COLUMNS = (
+    "order_id",
+    "status",
+    "user",
+    "price",
+    "created_at",
+    "confirmed_on",
+    "estimated_time",
+    "order_ready_in",
+    "archived",
+    "item_id",
+    "quantity",
+    "flavor",
+    "size",
+    "unit_price",
+    "payments",
+    "amount_paid",
+)
+
+ORDER_EXPORT_MEDIA_TYPES = {
+    OrderExportFormat.NDJSON: "application/x-ndjson",
+    OrderExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _order_document(order: Dict[str, Any]) -> Dict[str, Any]:
+    document = {key: _plain(value) for key, value in order.items() if key not in ("items", "payments")}
+    document["items"] = [{key: _plain(value) for key, value in item.items()} for item in order["items"]]
+    document["payments"] = [{key: _plain(value) for key, value in payment.items()} for payment in order["payments"]]
+    return document
+
+
+def _ndjson_chunk(orders: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(_order_document(order), separators=(",", ":")) + "\n" for order in orders)
+
+
+def _csv_rows(order: Dict[str, Any]):
+    head = [
+        order["id"],
+        _plain(order["status"]),
+        order["user"],
+        order["price"],
+        _plain(order["created_at"]),
+        _plain(order["confirmed_on"]),
+        _plain(order["estimated_time"]),
+        _plain(order["order_ready_in"]),
+        order["archived"],
+    ]
+    tail = [
+        len(order["payments"]),
+        sum((payment["amount_paid"] or 0 for payment in order["payments"]), Decimal(0)),
+    ]
+    if not order["items"]:
+        yield head + [None] * 5 + tail
+    for item in order["items"]:
+        yield head + [item["id"], item["quantity"], item["flavor"], _plain(item["size"]), item["unit_price"]] + tail
+
+
+def _csv_text(rows: Iterable[list]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _csv_chunk(orders: List[Dict[str, Any]]) -> str:
+    return _csv_text(row for order in orders for row in _csv_rows(order))
+
+
+async def encode_order_export(
+    partitions: AsyncIterator[List[Dict[str, Any]]],
+    export_format: OrderExportFormat,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+
+    # One chunk per partition of orders, gzip-compressed incrementally when asked
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor is not None else data
+
+    if export_format == OrderExportFormat.CSV:
+        to_text = _csv_chunk
+        yield encode(_csv_text([ORDER_EXPORT_CSV_COLUMNS]))
+    else:
+        to_text = _ndjson_chunk
+
+    async for orders in partitions:
+        chunk = encode(to_text(orders))
+        if chunk:
+            yield chunk
+
+    if compressor is not None:
+        yield compressor.flush()
@@ -1,7 +1,8 @@
 from typing import Dict, Any
 from decimal import Decimal
 
-from app.db.models.schemas import Order, PaymentStatus
+from app.db.models.schemas import PaymentStatus
+from app.schemas.order_schemas import OrderSchema
 from app.repository.payment_repository import PaymentRepository
 from app.integrations.payment_gateway.stripe_client import StripeClient
 from app.integrations.payment_gateway.stripe_config import settings
@@ -17,7 +18,7 @@ class PaymentService:
         self.client = StripeClient()
         self.payment_repository = payment_repository
 
-    async def create_checkout_session(self, order: Order) -> Dict[str, Any]:
+    async def create_checkout_session(self, order: OrderSchema) -> Dict[str, Any]:
 
         if order.price <= 0:
             raise OrderEqualToZeroError()
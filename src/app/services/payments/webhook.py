@@ -5,7 +5,7 @@ import stripe
 from app.repository.payment_repository import PaymentRepository
 from app.db.models.schemas import PaymentStatus
 
-from app.events.dispatcher import EventDispatcher
+from app.repository.outbox_repository import OutboxRepository
 from app.events.order_events import ConfirmPaidOrderEvent
 
 from app.integrations.payment_gateway.stripe_client import StripeClient
@@ -16,11 +16,11 @@ class WebHookService:
     def __init__(
         self,
         payment_repository: PaymentRepository,
-        event_dispatcher: EventDispatcher
+        outbox_repository: OutboxRepository
     ):
         self.client = StripeClient()
         self.payment_repository = payment_repository
-        self.event_dispatcher = event_dispatcher
+        self.outbox_repository = outbox_repository
 
     async def handler_webhook_event(self, payload, sig_header) -> Dict[str, Any]:
         event = self.client.webhook_construct_event(
@@ -49,7 +49,8 @@ class WebHookService:
             payment=payment,
             status=PaymentStatus.PAID
         )
-        await self.event_dispatcher.dispatch(
+        # Published by the outbox relay once the payment update commits
+        self.outbox_repository.add(
             ConfirmPaidOrderEvent(
                 user_email=customer_email,
                 user_name=customer_name,
@@ -0,0 +1,89 @@
+import sys
+import time
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import (
+    Base, Order, OrderItem, OrderStatus, ItemSize, Payment, PaymentStatus, User, ArchivedOrder,
+)
+from app.repository.archive_repository import ArchiveRepository
+
+
+# Throughput of the archival job: closed orders (with items and a payment each) moved
+# to the archive tables, one transaction per batch, for several batch sizes.
+# Usage (from src/): python -m app.utils.benchmark_archive [orders] [items_per_order]
+
+BATCH_SIZES = (50, 200, 500, 2000)
+
+
+async def seed(engine, orders: int, items_per_order: int):
+    created_at = datetime(2024, 1, 1)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert().values(
+            id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+        ))
+        await connection.execute(Order.__table__.insert(), [
+            {
+                "id": order_id,
+                "user": 1,
+                "status": OrderStatus.COMPLETED if order_id % 4 else OrderStatus.CANCELED,
+                "price": 10 * items_per_order,
+                "created_at": created_at + timedelta(seconds=order_id),
+            }
+            for order_id in range(1, orders + 1)
+        ])
+        await connection.execute(OrderItem.__table__.insert(), [
+            {"order": order_id, "quantity": 1, "flavor": "bench", "size": ItemSize.SMALL, "unit_price": 10}
+            for order_id in range(1, orders + 1)
+            for _ in range(items_per_order)
+        ])
+        await connection.execute(Payment.__table__.insert(), [
+            {"id": f"bench-{order_id}", "status": PaymentStatus.PAID, "related_order": order_id, "amount_paid": 10}
+            for order_id in range(1, orders + 1)
+        ])
+
+
+async def archive_all(engine, batch_size: int) -> int:
+    cutoff = datetime(2025, 1, 1)
+    archived = 0
+    while True:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            async with session.begin():
+                archive_repository = ArchiveRepository(session)
+                order_ids = await archive_repository.select_archivable_order_ids(cutoff, batch_size)
+                archived += await archive_repository.archive_orders(order_ids)
+        if len(order_ids) < batch_size:
+            return archived
+
+
+async def main(orders: int, items_per_order: int):
+    print(f"{'batch size':>10}{'orders':>10}{'seconds':>10}{'orders/s':>12}")
+    for batch_size in BATCH_SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = get_engine(DatabaseSettings(DB_URL=f"sqlite+aiosqlite:///{directory}/benchmark.db"))
+            await seed(engine, orders, items_per_order)
+
+            start = time.perf_counter()
+            archived = await archive_all(engine, batch_size)
+            elapsed = time.perf_counter() - start
+
+            async with AsyncSession(engine) as session:
+                in_archive = await session.scalar(select(func.count()).select_from(ArchivedOrder))
+            assert archived == in_archive == orders, (archived, in_archive, orders)
+
+            print(f"{batch_size:>10}{archived:>10}{elapsed:>10.2f}{archived / elapsed:>12.0f}")
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        orders=int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        items_per_order=int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    ))
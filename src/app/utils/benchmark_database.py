@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+from contextlib import redirect_stdout
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import Base, Order, OrderStatus, User
+
+
+# Compares the old engine defaults (echo=True, no pool tuning, no pragmas)
+# with the tuned profile on a throwaway SQLite file.
+# Usage (from src/): python -m app.utils.benchmark_database [operations] [concurrency]
+
+async def run_workload(engine: AsyncEngine, operations: int, concurrency: int) -> float:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert().values(
+            id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+        ))
+
+    async def worker(count: int):
+        for _ in range(count):
+            async with engine.begin() as connection:
+                await connection.execute(Order.__table__.insert().values(user=1, status=OrderStatus.PENDING, price=0))
+                await connection.execute(select(Order.id).where(Order.user == 1).limit(10))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(operations // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+    return (operations // concurrency) * concurrency / elapsed
+
+
+async def main(operations: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{directory}/benchmark.db"
+
+        # echo=True still formats and writes every statement, just not to the terminal
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            old_defaults = create_async_engine(url=url, echo=True, future=True)
+            old_throughput = await run_workload(old_defaults, operations, concurrency)
+
+        tuned = get_engine(DatabaseSettings(DB_URL=url))
+        tuned_throughput = await run_workload(tuned, operations, concurrency)
+
+    print(f"{'profile':<16}{'ops/s':>10}")
+    print(f"{'old defaults':<16}{old_throughput:>10.0f}")
+    print(f"{'tuned':<16}{tuned_throughput:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        operations=int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        concurrency=int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    ))
@@ -0,0 +1,69 @@
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app.db.models.schemas import Order, OrderItem, OrderStatus, ItemSize
+from app.lib.msgpack_serializer import SERIALIZER_NAME
+from tasks.celery_app import celery_app # registers the typed msgpack serializer
+
+
+# Size and encode/decode time of the estimate_order_time message body (the event's
+# order.to_dict snapshot with its Decimals and datetimes) in today's JSON against
+# typed msgpack, through kombu's serializer registry as Celery uses it.
+# Usage (from src/): python -m app.utils.benchmark_event_payloads [iterations]
+
+def order_snapshot(items: int) -> dict:
+    created_at = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    order = Order(
+        id=123456,
+        status=OrderStatus.PREPARING,
+        price=Decimal("31.90") * items,
+        created_at=created_at,
+        confirmed_on=created_at + timedelta(minutes=3),
+        items=[
+            OrderItem(
+                id=1000 + item,
+                quantity=1 + item % 3,
+                flavor="margherita with extra basil",
+                size=ItemSize.AVERAGE,
+                unit_price=Decimal("31.90"),
+                order=123456,
+            )
+            for item in range(items)
+        ],
+    )
+    return order.to_dict
+
+
+def measure(body, serializer: str, iterations: int):
+    content_type, content_encoding, data = dumps(body, serializer=serializer)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dumps(body, serializer=serializer)
+    encode = (time.perf_counter() - start) / iterations * 1_000_000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decoded = loads(data, content_type, content_encoding, accept=prepare_accept_content(celery_app.conf.accept_content))
+    decode = (time.perf_counter() - start) / iterations * 1_000_000
+
+    assert decoded == loads(dumps(body, serializer="json")[2], "application/json", "utf-8"), serializer
+    return len(data), encode, decode
+
+
+def main(iterations: int):
+    print(f"{'items':>6}  {'serializer':<15}{'bytes':>8}{'encode us':>11}{'decode us':>11}")
+    for items in (1, 5, 20, 100):
+        # Protocol 2 task body: (args, kwargs, embed)
+        body = (({"target_order": order_snapshot(items)},), {}, {"callbacks": None, "errbacks": None, "chain": None})
+        for serializer in ("json", SERIALIZER_NAME):
+            size, encode, decode = measure(body, serializer, iterations)
+            print(f"{items:>6}  {serializer:<15}{size:>8}{encode:>11.1f}{decode:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,49 @@
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from jose import jwk, jwt
+
+import app.lib.eddsa  # pylint: disable=unused-import # registers the EdDSA key type in jose
+from app.utils.generate_keys import KEY_GENERATORS
+
+
+# Micro-benchmark of token signing and verification per algorithm.
+# Keys are parsed once up front, the same way the key ring does it.
+# Usage (from src/): python -m app.utils.benchmark_jwt [iterations]
+
+def benchmark(algorithm: str, iterations: int):
+    private_pem, public_pem = KEY_GENERATORS[algorithm]()
+    private_key = jwk.construct(private_pem, algorithm)
+    public_key = jwk.construct(public_pem, algorithm)
+
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": "1",
+        "iss": "delivery-api",
+        "iat": int(now.timestamp()),
+        "exp": now + timedelta(minutes=30),
+    }
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        token = jwt.encode(claims=claims, key=private_key, algorithm=algorithm)
+    sign_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        jwt.decode(token=token, key=public_key, algorithms=[algorithm], options={"verify_aud": False})
+    verify_seconds = time.perf_counter() - start
+
+    return iterations / sign_seconds, iterations / verify_seconds, len(token)
+
+
+def main(iterations: int):
+    print(f"{'algorithm':<10}{'sign/s':>12}{'verify/s':>12}{'token bytes':>14}")
+    for algorithm in KEY_GENERATORS:
+        signs, verifies, token_size = benchmark(algorithm, iterations)
+        print(f"{algorithm:<10}{signs:>12.0f}{verifies:>12.0f}{token_size:>14}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,77 @@
+import sys
+import time
+import asyncio
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import Base, Order, OrderItem, OrderStatus, ItemSize, User
+from app.repository.order_repository import OrderRepository
+from app.schemas.order_schemas import OrderExportFormat, OrderExportParams
+from app.services.orders.order import OrderService
+
+
+# Peak Python memory and throughput of the order export for growing row counts;
+# the peak should stay flat, since only one partition of orders is held at a time.
+# Usage (from src/): python -m app.utils.benchmark_order_export [max_orders] [items_per_order]
+
+async def seed(engine, orders: int, items_per_order: int):
+    created_at = datetime(2024, 1, 1)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert().values(
+            id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+        ))
+        await connection.execute(Order.__table__.insert(), [
+            {"id": order_id, "user": 1, "status": OrderStatus.COMPLETED, "price": 10 * items_per_order,
+             "created_at": created_at + timedelta(seconds=order_id)}
+            for order_id in range(1, orders + 1)
+        ])
+        await connection.execute(OrderItem.__table__.insert(), [
+            {"order": order_id, "quantity": 1, "flavor": "bench", "size": ItemSize.SMALL, "unit_price": 10}
+            for order_id in range(1, orders + 1)
+            for _ in range(items_per_order)
+        ])
+
+
+async def export(engine, orders: int, export_format: OrderExportFormat, compress: bool):
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(seconds=orders + 1)
+    exported = 0
+    async with AsyncSession(engine) as session:
+        service = OrderService(order_repository=OrderRepository(session))
+        export_params = OrderExportParams(start=start, end=end, export_format=export_format, gzip=compress)
+        async for chunk in service.export_orders(export_params):
+            exported += len(chunk)
+    return exported
+
+
+async def main(max_orders: int, items_per_order: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(DatabaseSettings(DB_URL=f"sqlite+aiosqlite:///{directory}/benchmark.db"))
+        await seed(engine, max_orders, items_per_order)
+
+        print(f"{'format':<10}{'orders':>10}{'MB out':>10}{'orders/s':>12}{'peak MB':>10}")
+        for export_format, compress in ((OrderExportFormat.NDJSON, False), (OrderExportFormat.CSV, True)):
+            name = export_format.value + (".gz" if compress else "")
+            for orders in (max_orders // 10, max_orders // 2, max_orders):
+                tracemalloc.start()
+                started = time.perf_counter()
+                exported = await export(engine, orders, export_format, compress)
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{name:<10}{orders:>10}{exported / 2**20:>10.1f}{orders / elapsed:>12.0f}{peak / 2**20:>10.1f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        max_orders=int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        items_per_order=int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    ))
@@ -0,0 +1,86 @@
+import sys
+import time
+import asyncio
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import Base, Order, OrderItem, OrderStatus, ItemSize, User
+from app.repository.order_repository import OrderRepository
+from app.services.orders.order import OrderService
+
+
+# Round-trips and latency of the entity lookups that open cancel, add-item and
+# delete-item: the original sequential session.get calls (order with its selectin
+# items, user, item) against OrderService._ensure_entities_exists.
+# Usage (from src/): python -m app.utils.benchmark_order_lookups [operations]
+
+async def seed(engine, orders: int):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert().values(
+            id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+        ))
+        await connection.execute(Order.__table__.insert(), [
+            {"id": order_id, "user": 1, "status": OrderStatus.PENDING, "price": 0} for order_id in range(1, orders + 1)
+        ])
+        await connection.execute(OrderItem.__table__.insert(), [
+            {"id": order_id, "order": order_id, "quantity": 1, "flavor": "bench", "size": ItemSize.SMALL, "unit_price": 10}
+            for order_id in range(1, orders + 1)
+        ])
+
+
+def original(with_item: bool):
+    async def lookup(session: AsyncSession, order_id: int):
+        order = await session.get(Order, order_id, options=[selectinload(Order.items)])
+        await session.get(User, order.user)
+        if with_item:
+            await session.get(OrderItem, order_id)
+    return lookup
+
+
+def current(with_item: bool):
+    async def lookup(session: AsyncSession, order_id: int):
+        service = OrderService(order_repository=OrderRepository(session))
+        # pylint: disable=protected-access
+        await service._ensure_entities_exists(order_id=order_id, order_item_id=order_id if with_item else None)
+    return lookup
+
+
+async def measure(engine, lookup, operations: int):
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    for order_id in range(1, operations + 1):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await lookup(session, order_id)
+    elapsed = time.perf_counter() - start
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    return len(statements) / operations, elapsed / operations * 1_000_000
+
+
+async def main(operations: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(DatabaseSettings(DB_URL=f"sqlite+aiosqlite:///{directory}/benchmark.db"))
+        await seed(engine, operations)
+
+        print(f"{'operation':<14}{'version':<10}{'round-trips':>12}{'us/op':>10}")
+        for operation, with_item in (("cancel", False), ("add-item", False), ("delete-item", True)):
+            for version, lookup in (("original", original(with_item)), ("current", current(with_item))):
+                round_trips, latency = await measure(engine, lookup, operations)
+                print(f"{operation:<14}{version:<10}{round_trips:>12.1f}{latency:>10.0f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,95 @@
+import sys
+import time
+import asyncio
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import Base, Order, OrderItem, OrderStatus, ItemSize, User
+from app.repository.order_repository import OrderRepository
+from app.schemas.order_schemas import OrderSchema
+
+
+# Query count and latency of the order read paths, before and after explicit loading:
+# existence checks with and without the old selectin items, and OrderSchema built
+# from ORM objects versus the Core projection.
+# Usage (from src/): python -m app.utils.benchmark_order_reads [reads] [items_per_order]
+
+async def seed(engine, orders: int, items_per_order: int):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert().values(
+            id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+        ))
+        await connection.execute(Order.__table__.insert(), [
+            {"id": order_id, "user": 1, "status": OrderStatus.PENDING, "price": 0} for order_id in range(1, orders + 1)
+        ])
+        await connection.execute(OrderItem.__table__.insert(), [
+            {"order": order_id, "quantity": 1, "flavor": "bench", "size": ItemSize.SMALL, "unit_price": 10}
+            for order_id in range(1, orders + 1)
+            for _ in range(items_per_order)
+        ])
+
+
+async def check_with_items(session: AsyncSession, order_id: int):
+    # What every session.get(Order) did while items were lazy="selectin"
+    return await session.get(Order, order_id, options=[selectinload(Order.items)])
+
+
+async def check_without_items(session: AsyncSession, order_id: int):
+    return await session.get(Order, order_id)
+
+
+async def schema_from_orm(session: AsyncSession, order_id: int):
+    order = await session.get(Order, order_id, options=[selectinload(Order.items)])
+    return OrderSchema.model_validate(order)
+
+
+async def schema_from_projection(session: AsyncSession, order_id: int):
+    return await OrderRepository(session).get_order_projection(order_id)
+
+
+async def measure(engine, read, reads: int):
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    for order_id in range(1, reads + 1):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await read(session, order_id)
+    elapsed = time.perf_counter() - start
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    return len(statements) / reads, elapsed / reads * 1_000_000
+
+
+async def main(reads: int, items_per_order: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(DatabaseSettings(DB_URL=f"sqlite+aiosqlite:///{directory}/benchmark.db"))
+        await seed(engine, reads, items_per_order)
+
+        print(f"{'read path':<32}{'queries':>10}{'us/read':>10}")
+        for name, read in (
+            ("check, selectin items (old)", check_with_items),
+            ("check, raiseload", check_without_items),
+            ("OrderSchema from ORM", schema_from_orm),
+            ("OrderSchema from projection", schema_from_projection),
+        ):
+            queries, latency = await measure(engine, read, reads)
+            print(f"{name:<32}{queries:>10.1f}{latency:>10.0f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        reads=int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        items_per_order=int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
@@ -0,0 +1,84 @@
+import sys
+import random
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_engine
+from app.db.settings import DatabaseSettings
+from app.db.models.schemas import Base, Order, OrderStatus, User
+from app.repository.order_repository import OrderRepository
+
+
+# Query-plan check of the order listing: seeds a throwaway SQLite file, runs the
+# repository query, and fails unless it searches ix_orders_status_created_at.
+# Usage (from src/): python -m app.utils.explain_order_listing [orders]
+
+INDEX_NAME = "ix_orders_status_created_at"
+
+
+async def seed(connection, orders: int):
+    await connection.run_sync(Base.metadata.create_all)
+    await connection.execute(User.__table__.insert().values(
+        id=1, name="bench", email="bench@example.com", password=b"", active=True, admin=False,
+    ))
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    statuses = list(OrderStatus)
+    batch = []
+    for _ in range(orders):
+        batch.append({
+            "user": 1,
+            "status": random.choice(statuses),
+            "price": 0,
+            "created_at": now - timedelta(minutes=random.randint(0, 60 * 24 * 365)),
+        })
+        if len(batch) == 50_000:
+            await connection.execute(Order.__table__.insert(), batch)
+            batch = []
+    if batch:
+        await connection.execute(Order.__table__.insert(), batch)
+    await connection.execute(text("ANALYZE"))
+
+
+async def main(orders: int) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(DatabaseSettings(DB_URL=f"sqlite+aiosqlite:///{directory}/plan.db"))
+        async with engine.begin() as connection:
+            await seed(connection, orders)
+
+        captured = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def capture(_connection, _cursor, statement, parameters, _context, _executemany):
+            captured.append((statement, parameters))
+
+        async with AsyncSession(engine) as session:
+            rows = await OrderRepository(session).list_order_summaries_by_status(OrderStatus.COMPLETED)
+
+        statement, parameters = captured[-1]
+        async with engine.connect() as connection:
+            result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = [row[-1] for row in result]
+
+        await engine.dispose()
+
+    print(f"{orders} orders seeded, {len(rows)} listed")
+    for line in plan:
+        print(f"  {line}")
+
+    # SQLite has no INCLUDE columns, so a plain index search is the best plan it can pick;
+    # PostgreSQL turns the same query into an index-only scan
+    if not any(f"INDEX {INDEX_NAME}" in line for line in plan):
+        print(f"FAIL: the listing does not use {INDEX_NAME}")
+        return 1
+
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)))
@@ -1,39 +1,64 @@
+import sys
+
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import rsa, ec, ed25519
 from cryptography.hazmat.backends import default_backend
 
 
-# --- 1. Geração das Chaves RSA (Privada e Pública) ---
+# --- 1. Geração das Chaves (Privada e Pública) ---
 
 def generate_rsa_key_pair():
     """Gera um par de chaves RSA (2048 bits) para RS256."""
-    # Geração da chave privada
     private_key = rsa.generate_private_key(
         public_exponent=65537,
         key_size=2048,
         backend=default_backend()
     )
+    return serialize_key_pair(private_key)
+
+
+def generate_ec_key_pair():
+    """Gera um par de chaves EC (curva P-256) para ES256."""
+    private_key = ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+    return serialize_key_pair(private_key)
+
+
+def generate_ed25519_key_pair():
+    """Gera um par de chaves Ed25519 para EdDSA."""
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    return serialize_key_pair(private_key)
 
-    # Serialização da chave privada (formato PEM)
+
+# --- 2. Serialização das Chaves (formato PEM) ---
+
+def serialize_key_pair(private_key):
     private_pem = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PrivateFormat.PKCS8,
         encryption_algorithm=serialization.NoEncryption()
     )
 
-    # Serialização da chave pública (formato PEM)
-    public_key = private_key.public_key()
-    public_pem = public_key.public_bytes(
+    public_pem = private_key.public_key().public_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     )
 
     return private_pem.decode('utf-8'), public_pem.decode('utf-8')
 
-private, public = generate_rsa_key_pair()
-print(private)
-print("/n")
-print("/n")
-print("/n")
-print("/n")
-print(public)
\ No newline at end of file
+
+KEY_GENERATORS = {
+    "RS256": generate_rsa_key_pair,
+    "ES256": generate_ec_key_pair,
+    "EdDSA": generate_ed25519_key_pair,
+}
+
+if __name__ == "__main__":
+    # python generate_keys.py [RS256|ES256|EdDSA] -> use the same value in JWT_ALGORITHM
+    algorithm = sys.argv[1] if len(sys.argv) > 1 else "RS256"
+    private, public = KEY_GENERATORS[algorithm]()
+    print(private)
+    print("/n")
+    print("/n")
+    print("/n")
+    print("/n")
+    print(public)
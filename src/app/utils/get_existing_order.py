@@ -1,16 +1,17 @@
 from fastapi import Depends
 
 from app.db.connection import get_database
-from app.db.models.schemas import Order
-from app.schemas.order_schemas import CurrentOrder
+from app.repository.order_repository import OrderRepository
+from app.schemas.order_schemas import CurrentOrder, OrderSchema
 from app.core.exceptions import OrderNotFoundError
 
 async def order_exists(
     current_order: CurrentOrder,
     session = Depends(get_database)
-) -> Order:
+) -> OrderSchema:
 
-    order = await session.get(Order, current_order.order_id)
+    # Checkout charges this price: read it from the primary, never from the cache or a replica
+    order = await OrderRepository(session).get_order_projection(current_order.order_id)
     if not order:
         raise OrderNotFoundError()
     return order
@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import engine
+from app.db.models.schemas import KitchenDailyStats, KitchenHourlyStats, Order, OrderStatus
+from app.repository.kitchen_stats_repository import KitchenStatsRepository
+
+
+# Rebuilds the kitchen preparation statistics from every completed order, e.g. right
+# after the tables are created. Normally they are kept up to date by confirm_order_readiness.
+# Usage (from src/): python -m app.utils.rebuild_kitchen_stats
+
+async def main():
+    async with AsyncSession(engine) as session, session.begin():
+        await session.execute(KitchenHourlyStats.__table__.delete())
+        await session.execute(KitchenDailyStats.__table__.delete())
+
+        repository = KitchenStatsRepository(session)
+        result = await session.stream(
+            select(Order.confirmed_on, Order.order_ready_in)
+            .where(
+                Order.status == OrderStatus.COMPLETED,
+                Order.confirmed_on.is_not(None),
+                Order.order_ready_in.is_not(None),
+            )
+            .execution_options(yield_per=1000)
+        )
+        rebuilt = 0
+        async for confirmed_on, ready_at in result:
+            await repository.record_preparation(ready_at, (ready_at - confirmed_on).total_seconds() / 60)
+            rebuilt += 1
+
+    await engine.dispose()
+    print(f"Kitchen statistics rebuilt from {rebuilt} completed orders")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import sys
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.db.connection import engine
+from app.db.models.schemas import Order, OrderItem
+
+
+# Consistency check of the incrementally maintained order prices.
+# Reports every order whose price differs from the sum of its items and,
+# unless --check is given, rebuilds all of them with one bulk UPDATE.
+# Usage (from src/): python -m app.utils.rebuild_order_totals [--check]
+
+# Rounded to the price column's scale, like the deltas applied by the order listeners
+items_total = func.round(
+    select(func.coalesce(func.sum(OrderItem.unit_price * OrderItem.quantity), 0))
+    .where(OrderItem.order == Order.id)
+    .scalar_subquery(),
+    Order.price.type.scale,
+)
+
+
+async def main(check_only: bool) -> int:
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            select(Order.id, Order.price, items_total.label("expected"))
+            .where(Order.price != items_total)
+            .order_by(Order.id)
+        )
+        mismatches = result.all()
+
+        for order_id, price, expected in mismatches:
+            print(f"order {order_id}: price {price} != items total {expected}")
+
+        if mismatches and not check_only:
+            await connection.execute(
+                Order.__table__.update()
+                .where(Order.price != items_total)
+                .values(price=items_total)
+            )
+            print(f"{len(mismatches)} order totals rebuilt")
+
+    await engine.dispose()
+
+    if not mismatches:
+        print("All order totals are consistent")
+    return 1 if mismatches and check_only else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(check_only="--check" in sys.argv[1:])))
@@ -1,16 +1,14 @@
-import asyncio
 from typing import Dict, Any
 
 from celery import shared_task
 from openai import RateLimitError, APIConnectionError, InternalServerError
 
 from app.ai.services.estimated_time_service import ReadyTimeEstimationService
-from app.services.orders.order import OrderService
 from app.repository.order_repository import OrderRepository
-from app.repository.account_repository import AccountRepository
-from app.events.dispatcher_instance import dispatcher
+from app.repository.kitchen_stats_repository import KitchenStatsRepository
 
 from app.db.connection import get_session_to_worker
+from tasks.runtime import worker_runtime
 
 @shared_task(
     bind=True,
@@ -21,14 +19,9 @@ from app.db.connection import get_session_to_worker
 def estimate_order_time(_, data: Dict[str, Any]):
     async def run_task():
         async with get_session_to_worker() as session:
-            order_repository = OrderRepository(session=session)
             ai_estamation_service = ReadyTimeEstimationService(
-                order_repository=order_repository,
-                order_service=OrderService(
-                    account_repository=AccountRepository(session),
-                    order_repository=order_repository,
-                    event_dispatcher=dispatcher,
-                )
+                order_repository=OrderRepository(session=session),
+                kitchen_stats_repository=KitchenStatsRepository(session=session),
             )
             await ai_estamation_service.estimate(data["target_order"])
-    asyncio.run(run_task())
+    worker_runtime.run(run_task())
@@ -0,0 +1,46 @@
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+
+from celery import shared_task
+from dotenv import load_dotenv
+
+from app.repository.archive_repository import ArchiveRepository
+from app.db.connection import get_session_to_worker
+from tasks.runtime import worker_runtime
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "30"))
+ORDER_ARCHIVE_BATCH_SIZE = int(os.getenv("ORDER_ARCHIVE_BATCH_SIZE", "500"))
+# Upper bound of batches per run, so a large backlog drains over several runs
+ORDER_ARCHIVE_MAX_BATCHES = int(os.getenv("ORDER_ARCHIVE_MAX_BATCHES", "100"))
+
+
+async def archive_closed_orders_batches(
+    cutoff: datetime,
+    batch_size: int = ORDER_ARCHIVE_BATCH_SIZE,
+    max_batches: int = ORDER_ARCHIVE_MAX_BATCHES,
+) -> int:
+    archived = 0
+    for _ in range(max_batches):
+        # One short transaction per batch keeps the locks on the hot tables brief
+        async with get_session_to_worker() as session:
+            archive_repository = ArchiveRepository(session=session)
+            order_ids = await archive_repository.select_archivable_order_ids(cutoff, batch_size)
+            archived += await archive_repository.archive_orders(order_ids)
+
+        if len(order_ids) < batch_size:
+            break
+
+    return archived
+
+
+@shared_task
+def archive_closed_orders():
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=ORDER_ARCHIVE_AFTER_DAYS)
+    archived = worker_runtime.run(archive_closed_orders_batches(cutoff))
+    logger.info("Archived %s closed orders created before %s.", archived, cutoff.isoformat())
+    return archived
@@ -0,0 +1,176 @@
+import os
+import time
+import signal
+import asyncio
+import logging
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from celery import group
+from celery.canvas import Signature
+from dotenv import load_dotenv
+from kombu.utils.json import loads
+from prometheus_client import start_http_server
+
+from app.db.connection import engine, get_session_to_worker
+from app.db.models.schemas import OutboxMessage
+from app.events.order_events import ORDER_EVENTS
+from app.events.dispatcher_instance import dispatcher
+from app.events.handlers.order_handlers import register_order_handlers
+from app.repository.outbox_repository import OutboxRepository
+from app.lib.metrics import (
+    OUTBOX_BATCH_MESSAGES,
+    OUTBOX_MESSAGES,
+    OUTBOX_PUBLISH_DURATION,
+    OUTBOX_TASKS,
+    register_stats,
+    span,
+)
+from tasks.celery_app import celery_app # the tasks publish through the configured broker
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "0.5"))
+# Messages failing this many times stay in the table, unpublished, for inspection
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", "24"))
+OUTBOX_PRUNE_INTERVAL_SECONDS = 60.0
+# Prometheus endpoint of the relay process; 0 disables it
+OUTBOX_RELAY_METRICS_PORT = int(os.getenv("OUTBOX_RELAY_METRICS_PORT", "9102"))
+
+register_order_handlers(dispatcher)
+
+
+def publish(signatures: List[Signature]) -> None:
+    # One group: every message of the batch goes out over a single producer connection
+    with celery_app.producer_or_acquire() as producer:
+        group(signatures).apply_async(producer=producer)
+
+
+async def message_tasks(message: OutboxMessage) -> List[Signature]:
+    event = ORDER_EVENTS[message.event_type].from_payload(loads(message.payload))
+    # Handlers are resolved through the event's class hierarchy; events
+    # without any are simply marked published
+    dispatched = await dispatcher.dispatch(event)
+    if dispatched.failed:
+        # None of its tasks go out now; the whole message is retried in a later batch
+        raise RuntimeError(f"{dispatched.failed} handler(s) of {message.event_type} failed.")
+    return [signature for handler_signatures in dispatched.results for signature in handler_signatures]
+
+
+@dataclass(frozen=True, slots=True)
+class RelayBatch:
+
+    """Claimed outbox rows, split into those ready to publish and those that failed to dispatch."""
+
+    messages: List[OutboxMessage]
+    ready: List[OutboxMessage] = field(default_factory=list)
+    signatures: List[Signature] = field(default_factory=list)
+    # Tasks in the group by (event type, task name), counted once the publish settles
+    tasks: Counter = field(default_factory=Counter)
+    # (message id, error) pairs, marked after the publish: on SQLite the first UPDATE
+    # takes the database write lock, which must not be held while the broker is slow
+    failed: List[Tuple[int, str]] = field(default_factory=list)
+
+
+async def claim_batch(outbox_repository: OutboxRepository, batch_size: int, max_attempts: int) -> RelayBatch:
+    batch = RelayBatch(messages=await outbox_repository.claim_pending(batch_size, max_attempts))
+    if batch.messages:
+        OUTBOX_BATCH_MESSAGES.observe(len(batch.messages))
+
+    for message in batch.messages:
+        try:
+            message_signatures = await message_tasks(message)
+        except Exception as error: # pylint: disable=broad-except
+            logger.error("Outbox message %s cannot be relayed.", message.event_id, exc_info=error)
+            OUTBOX_MESSAGES.labels(message.event_type, "failed").inc()
+            batch.failed.append((message.id, repr(error)))
+            continue
+        batch.signatures.extend(message_signatures)
+        batch.tasks.update((message.event_type, signature.task) for signature in message_signatures)
+        batch.ready.append(message)
+
+    return batch
+
+
+async def publish_batch(outbox_repository: OutboxRepository, batch: RelayBatch) -> None:
+    outcome = "published"
+    try:
+        if batch.signatures:
+            with span("outbox.publish", messages=len(batch.ready), tasks=len(batch.signatures)):
+                with OUTBOX_PUBLISH_DURATION.time():
+                    await asyncio.to_thread(publish, batch.signatures)
+    except Exception as error: # pylint: disable=broad-except
+        outcome = "failed"
+        logger.error("Publishing %s outbox messages failed.", len(batch.ready), exc_info=error)
+        batch.failed.extend((message.id, repr(error)) for message in batch.ready)
+
+    if batch.ready and outcome == "published":
+        await outbox_repository.mark_published([message.id for message in batch.ready])
+    for message_id, error_message in batch.failed:
+        await outbox_repository.mark_failed([message_id], error_message)
+
+    for message in batch.ready:
+        OUTBOX_MESSAGES.labels(message.event_type, outcome).inc()
+    for (event_type, task), count in batch.tasks.items():
+        OUTBOX_TASKS.labels(event_type, task, outcome).inc(count)
+
+
+async def relay_batch(batch_size: int = OUTBOX_BATCH_SIZE, max_attempts: int = OUTBOX_MAX_ATTEMPTS) -> int:
+
+    # Delivery is at least once: a crash between publishing and the commit below
+    # publishes the batch again, so the tasks must tolerate duplicates
+    async with get_session_to_worker() as session:
+        outbox_repository = OutboxRepository(session=session)
+        batch = await claim_batch(outbox_repository, batch_size, max_attempts)
+        if batch.messages:
+            await publish_batch(outbox_repository, batch)
+        return len(batch.messages)
+
+
+async def prune_published(retention_hours: float = OUTBOX_RETENTION_HOURS) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    async with get_session_to_worker() as session:
+        return await OutboxRepository(session=session).delete_published_before(cutoff)
+
+
+async def run_relay() -> None:
+    stopping = asyncio.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError, RuntimeError):
+            asyncio.get_running_loop().add_signal_handler(signal_number, stopping.set)
+
+    logger.info("Outbox relay started (batch size %s).", OUTBOX_BATCH_SIZE)
+    pruned_at = float("-inf")
+    while not stopping.is_set():
+        try:
+            relayed = await relay_batch()
+            if relayed >= OUTBOX_BATCH_SIZE:
+                continue # a full batch: more are probably waiting
+
+            if time.monotonic() - pruned_at >= OUTBOX_PRUNE_INTERVAL_SECONDS:
+                await prune_published()
+                pruned_at = time.monotonic()
+        except Exception as error: # pylint: disable=broad-except
+            logger.error("Outbox relay iteration failed.", exc_info=error)
+
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stopping.wait(), OUTBOX_POLL_INTERVAL_SECONDS)
+
+    dispatcher.shutdown()
+    await engine.dispose()
+    logger.info("Outbox relay stopped.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if OUTBOX_RELAY_METRICS_PORT:
+        register_stats("event_dispatcher", dispatcher.stats)
+        start_http_server(OUTBOX_RELAY_METRICS_PORT)
+    asyncio.run(run_relay())
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+
+from app.db.connection import engine
+
+
+def _gevent_active() -> bool:
+    try:
+        from gevent import monkey  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return False
+    return monkey.is_module_patched("threading")
+
+
+def _start_loop_thread(target: Callable[[], Any]) -> None:
+    # With the gevent pool the standard library is monkey-patched: the loop's selector
+    # waits on the gevent hub, so the loop runs as one more greenlet next to the tasks
+    # and a blocked `future.result()` only suspends the calling greenlet
+    if _gevent_active():
+        import gevent  # pylint: disable=import-outside-toplevel
+        gevent.spawn(target)
+        return
+    threading.Thread(target=target, name="worker-event-loop", daemon=True).start()
+
+
+class WorkerRuntime:
+
+    """
+    One long-lived event loop per worker process, running in its own thread
+    (or greenlet, under the gevent pool).
+
+    Async task bodies are submitted to it with `run()`, so no task creates its
+    own loop and the engine's pooled connections, which are bound to the loop
+    that opened them, are reused across tasks instead of reconnecting.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            _start_loop_thread(self._loop.run_forever)
+
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        if self._loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(engine.dispose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+worker_runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def start_runtime_in_child(**_):
+    # Prefork child: connections inherited from the parent must not be reused
+    engine.sync_engine.dispose(close=False)
+    worker_runtime.start()
+
+
+@worker_init.connect
+def start_runtime(sender=None, **_):
+    # gevent/threads/solo pools run tasks in the main process; prefork starts in each child
+    pool_cls = getattr(sender, "pool_cls", "")
+    pool_name = pool_cls if isinstance(pool_cls, str) else getattr(pool_cls, "__module__", "")
+    if "prefork" not in pool_name:
+        worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_runtime(**_):
+    worker_runtime.stop()